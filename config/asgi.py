@@ -3,6 +3,11 @@ ASGI config for mock_interview_system project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with an ASGI server so the async endpoints (``/api/async/...``) can hold
+many in-flight interviews per worker, e.g.::
+
+    uvicorn config.asgi:application --workers 2
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
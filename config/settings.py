@@ -78,6 +78,10 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Take the write lock when a transaction starts, so concurrent read-then-write
+        # transactions (e.g. allocating a question ordinal) wait instead of failing
+        # with "database is locked"
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
     }
 }
 
@@ -123,3 +127,139 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 import os
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# AI pipeline
+# Whisper is not thread-safe, so the async pipeline runs it on a small bounded executor.
+# The async endpoint's latency against the sync one has not been measured yet; run
+# `python manage.py bench_process_response answer.webm` against a deployment before relying on it.
+AI_TRANSCRIPTION_WORKERS = 1
+
+# Background job queue (drained by `python manage.py process_jobs`)
+JOB_POLL_INTERVAL = 1.0  # seconds between queue polls / SSE status checks
+JOB_LEASE_SECONDS = 300  # a running job older than this is assumed abandoned
+JOB_MAX_ATTEMPTS = 3
+JOB_EVENTS_TIMEOUT = 300  # max lifetime of a job SSE stream
+
+# Text-to-speech
+# When enabled, question audio URLs point at the streamed endpoint, which synthesises sentences
+# concurrently and starts playback with the first one. Serve via ASGI so the stream isn't buffered.
+TTS_PIPELINED = False
+TTS_PIPELINE_CONCURRENCY = 4
+
+# Speech-to-text backend: 'whisper' (openai-whisper, fp32) or 'faster-whisper' (CTranslate2, int8 on CPU)
+# 'whisper' with the 'base' model is the original setup. faster-whisper's speed and word error
+# rate have not been measured here; run `python manage.py bench_asr manifest.json` on recorded
+# answers with reference transcripts before switching.
+TRANSCRIPTION_BACKEND = 'whisper'
+TRANSCRIPTION_MODEL = 'base'
+TRANSCRIPTION_COMPUTE_TYPE = None  # faster-whisper only; None = int8
+
+# Transcription executor:
+#   'inline'  - shared in-process model, one transcribe() per request
+#   'batched' - uploads arriving within the window are decoded in one batched forward pass
+#   'process' - pool of worker processes, each with its own model and pinned torch threads
+# 'inline' is the original behaviour. Neither 'batched' nor 'process' throughput has been
+# measured with real weights ('batched' also skips transcribe()'s temperature fallback), and
+# neither have the pool size and torch thread defaults below. Compare the modes with
+# `python manage.py bench_transcription answer1.webm ... --workers 2 4` before switching.
+TRANSCRIPTION_EXECUTOR = 'inline'
+WHISPER_BATCH_WINDOW_MS = 50
+WHISPER_BATCH_MAX_SIZE = 8
+WHISPER_PROCESS_WORKERS = None  # None = one worker per WHISPER_TORCH_THREADS cores
+WHISPER_TORCH_THREADS = 1
+
+# Voice-activity trimming before transcription: leading/trailing silence is cut and
+# internal pauses longer than VAD_MAX_PAUSE_SECONDS are shortened to VAD_KEEP_PAUSE_SECONDS.
+# Durations are stored on Response.audio_stats. The transcription time saved has not been
+# measured on real answers yet; `python manage.py bench_vad answer1.webm ...` reports it.
+VAD_TRIM_SILENCE = True
+VAD_MAX_PAUSE_SECONDS = 1.0
+VAD_KEEP_PAUSE_SECONDS = 0.3
+
+# Synthesised speech is cached under MEDIA_ROOT/tts by hash of (text, voice, format);
+# least recently used files are evicted once the directory exceeds this size.
+TTS_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Report PDFs are rendered by the job worker when an interview completes and stored under
+# MEDIA_ROOT/reports; downloads return 202 with Retry-After until the file is ready.
+# Set REPORT_PDF_BACKGROUND = False to render on first download when no worker is running.
+REPORT_PDF_BACKGROUND = True
+REPORT_PDF_RETRY_AFTER = 5  # seconds
+# A stored fallback report (built while Ollama was down) is regenerated on a later view once
+# Ollama is back, but retried at most this often (seconds) while generation keeps failing.
+REPORT_REGENERATE_BACKOFF = 600
+
+# Report generation: 'single' sends the whole interview in one LLM call; 'map_reduce'
+# analyses each answer in its own small call (REPORT_MAP_PARALLELISM at a time) and merges
+# them with one short reduce call. Parallelism is capped at OLLAMA_MAX_CONCURRENCY, since the
+# report_map deadline includes queueing; raise both (and OLLAMA_NUM_PARALLEL on the Ollama
+# server) together. Each map call still shares the slots with live interviews, so a busy
+# server can push some answers past the deadline; those fall back to their stored feedback.
+REPORT_MODE = 'single'
+REPORT_MAP_PARALLELISM = 4
+
+# Caches. 'conversation' holds each session's rolling interview state; it is file-based so the
+# web server and `process_jobs` workers on one host share it. Use Redis/Memcached across hosts.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'conversation': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache', 'conversation'),
+    },
+}
+CONVERSATION_CACHE_ALIAS = 'conversation'
+CONVERSATION_CACHE_TIMEOUT = 6 * 60 * 60  # seconds; a cold session is rebuilt from the database
+
+# Ollama circuit breaker: after this many consecutive failed calls, requests go straight to
+# the fallback responses; a background probe retries Ollama every reset timeout (seconds).
+OLLAMA_BREAKER_FAILURE_THRESHOLD = 3
+OLLAMA_BREAKER_RESET_TIMEOUT = 30
+
+# Shared Ollama client. OLLAMA_HOST=None uses the ollama library default (env OLLAMA_HOST or
+# localhost:11434). Timeouts are in seconds; the read timeout bounds a whole generation and is
+# raised to the longest OLLAMA_MODELS deadline, so task deadlines always apply first.
+OLLAMA_HOST = None
+OLLAMA_CONNECT_TIMEOUT = 2.0
+OLLAMA_READ_TIMEOUT = 120.0
+# Generations sent to Ollama at once; further requests queue in arrival order and fall back
+# to the canned responses if no slot frees up within OLLAMA_QUEUE_TIMEOUT seconds.
+OLLAMA_MAX_CONCURRENCY = 2
+OLLAMA_QUEUE_TIMEOUT = 30.0
+# How long Ollama keeps the model (and its prompt cache) loaded after a call (Ollama's own
+# default is 5m). The prompt-cache saving from this and the static-first interviewer prompt has
+# not been measured yet; `python manage.py bench_prompt_cache` compares the layouts per turn.
+OLLAMA_KEEP_ALIVE = '30m'
+
+# Model and deadline (seconds) per Ollama task. A call that misses its deadline, including
+# time spent queueing, is cancelled and the task's fallback is used instead.
+#   interviewer: per-turn scoring and next question (small, fast model)
+#   report_map:  per-answer analysis in REPORT_MODE = 'map_reduce'
+#   summary:     rolling conversation summary (background job)
+#   report:      comprehensive report and the map-reduce merge step
+# The interviewer used 'llama3' with no deadline before. The smaller model and its 12 s
+# deadline have not been measured for question quality or timeouts; `python manage.py llm_stats`
+# shows per-model timings and fallback counts on real sessions. Set it back to 'llama3' with a
+# longer deadline if the smaller model falls short.
+OLLAMA_MODELS = {
+    'interviewer': {'model': 'llama3.2:3b', 'deadline': 12.0},
+    'report_map': {'model': 'llama3.2:3b', 'deadline': 30.0},
+    'summary': {'model': 'llama3.2:3b', 'deadline': 30.0},
+    'report': {'model': 'llama3', 'deadline': 180.0},
+}
+
+# Rolling per-session summary: a background job folds each answered turn into a summary of
+# at most this many words, and the interviewer prompt sends it instead of the older turns.
+CONVERSATION_SUMMARY = True
+CONVERSATION_SUMMARY_MAX_WORDS = 180
+
+# Interviewer prompt: 'full' (detailed instructions and per-question guidelines) or 'compact'
+# (a short prompt with one-line stage hints). Each Response stores the variant with Ollama's
+# token counts and timings; `python manage.py llm_stats` compares the two.
+INTERVIEWER_PROMPT = 'full'
+
+# Opening/fallback question banks and scoring keywords (JSON, see interview_core/question_bank.py).
+# Edits are picked up without a restart; files are re-checked at most this often (seconds).
+QUESTION_BANK_DIR = os.path.join(BASE_DIR, 'interview_core', 'data')
+QUESTION_BANK_RELOAD_INTERVAL = 2.0
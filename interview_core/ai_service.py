@@ -1,76 +1,37 @@
-import whisper
-import ollama
 import json
 import os
-import uuid
+import re
 import asyncio
 import edge_tts
 from django.conf import settings
 from asgiref.sync import async_to_sync
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from .streaming import JSONStringFieldStream
+from .tts_cache import TTSCache
+from .audio import trim_silence
+from .circuit_breaker import CircuitBreaker
+from .roles import classify
+from .question_bank import question_bank
+from .llm_client import llm_client, call_stats, AdmissionTimeout, DeadlineExceeded
+from .transcription import TranscriptionBatcher, ProcessPoolTranscriber, load_audio, load_backend
+
+TTS_VOICE = "en-US-AriaNeural"
+
+# Sentence boundaries for pipelined TTS: split after . ! ? followed by whitespace
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+# Generation options for per-turn interviewer calls
+INTERVIEWER_OPTIONS = {
+    'temperature': 0.7,  # Balanced creativity
+    'top_p': 0.9,
+    'num_predict': 500  # Allow longer responses
+}
 
-class AIService:
-    def __init__(self):
-        self._whisper_model = None  # Lazy load
-        self._ollama_available = None  # Cache Ollama availability
-
-    @property
-    def whisper_model(self):
-        if self._whisper_model is None:
-            print("Loading Whisper model...")
-            try:
-                self._whisper_model = whisper.load_model("base")
-                print("Whisper model loaded successfully")
-            except Exception as e:
-                print(f"Error loading Whisper: {e}")
-                self._whisper_model = None
-        return self._whisper_model
-    
-    def check_ollama_availability(self):
-        """Check if Ollama service is running"""
-        if self._ollama_available is not None:
-            return self._ollama_available
-        
-        try:
-            # Try a simple list command to check if Ollama is running
-            ollama.list()
-            self._ollama_available = True
-            print("Ollama service is available")
-            return True
-        except Exception as e:
-            print(f"Ollama service not available: {e}")
-            self._ollama_available = False
-            return False
-
-    def transcribe_audio(self, file_path):
-        if not self.whisper_model:
-            return "Error: Whisper model not loaded."
-        try:
-            result = self.whisper_model.transcribe(file_path)
-            return result["text"]
-        except Exception as e:
-            return f"Error transcribing: {str(e)}"
-
-    def generate_response(self, transcript, history, topic):
-        """
-        Sends transcript and history to Ollama to get feedback and next question.
-        Returns JSON: { "feedback": str, "score": int, "next_question": str }
-        """
-        # Check if Ollama is available
-        if not self.check_ollama_availability():
-            print("Ollama not available, using fallback response")
-            return self._generate_fallback_response(transcript, history, topic)
-        
-        question_number = len(history) + 1
-        
-        # Determine role category for specialized evaluation
-        role_category = self._determine_role_category(topic)
-        
-        system_prompt = f"""You are a SENIOR TECHNICAL INTERVIEWER with 15+ years of experience conducting interviews for FRESHER/STUDENT positions at top tech companies.
+# Interviewer instructions. Kept byte-identical across turns and sessions so Ollama can reuse
+# the evaluated prefix (KV cache); everything that varies per turn goes in the last message.
+INTERVIEWER_SYSTEM_PROMPT = """You are a SENIOR TECHNICAL INTERVIEWER with 15+ years of experience conducting interviews for FRESHER/STUDENT positions at top tech companies.
 
-ROLE CONTEXT: {topic}
-ROLE CATEGORY: {role_category}
-QUESTION NUMBER: {question_number}
 CANDIDATE LEVEL: FRESHER/STUDENT (0-2 years experience)
 
 YOUR MISSION: Conduct a REALISTIC, COMPREHENSIVE interview that evaluates if this FRESHER candidate has potential for growth and learning.
@@ -199,10 +160,7 @@ Structure your feedback for freshers:
 
 PART 4: NEXT QUESTION (COMPREHENSIVE INTERVIEW - Ask 10-12 questions!)
 
-Question Strategy for FRESHERS in {role_category}:
-
-**Question {question_number} Guidelines:**
-{self._get_question_guidelines(question_number, role_category, topic)}
+Question Strategy for FRESHERS: follow the QUESTION GUIDELINES given with the candidate's answer.
 
 INTERVIEW STRUCTURE (10-12 questions total):
 1. Introduction & Background
@@ -235,11 +193,11 @@ Make questions:
 
 RETURN FORMAT (ONLY VALID JSON):
 
-{{
+{
   "feedback": "Your encouraging, specific feedback here (3-5 sentences)",
   "score": X,
   "next_question": "Your natural, conversational question here"
-}}
+}
 
 Remember: 
 - You are interviewing a FRESHER/STUDENT
@@ -250,7 +208,406 @@ Remember:
 - Academic projects count as experience
 - Be a mentor, not just an evaluator"""
 
+# Compact interviewer prompt (INTERVIEWER_PROMPT = 'compact'): the same contract in a
+# fraction of the tokens, with a one-line stage hint instead of _get_question_guidelines
+INTERVIEWER_SYSTEM_PROMPT_COMPACT = """You are a senior technical interviewer running a mock interview for a FRESHER/STUDENT (0-2 years experience). Value potential, learning ability and honesty over expert knowledge; academic and personal projects count as experience.
+
+For the candidate's answer:
+1. Score it 1-10 against fresher expectations: 9-10 exceptional, 7-8 strong, 5-6 average, 3-4 below average, 1-2 not ready.
+2. Write 3-5 sentences of feedback: start with something specific they did well, give one or two concrete, actionable improvements, end encouragingly.
+3. Ask the next question for the stage in QUESTION GUIDELINES. Go slightly deeper after a score of 7+, simpler after a score below 4. Keep it conversational and suitable for a fresher.
+
+Return ONLY valid JSON:
+{"feedback": "...", "score": X, "next_question": "..."}"""
+
+INTERVIEW_STAGES = [
+    "Introduction & Background",
+    "Motivation & Interest",
+    "Technical Fundamentals (easy)",
+    "Technical Application (medium)",
+    "Problem-Solving Ability",
+    "Teamwork & Collaboration (behavioral)",
+    "Learning & Growth (behavioral)",
+    "Initiative & Passion (behavioral)",
+    "Career Goals",
+    "Strengths & Weaknesses",
+    "Candidate Questions",
+    "Closing",
+]
+
+# Map-reduce report mode (REPORT_MODE = 'map_reduce')
+REPORT_MAP_PROMPT = """You are an interview evaluator. Analyse ONE interview answer.
+
+Return ONLY valid JSON in this exact format:
+{
+    "strengths": ["short point"],
+    "weaknesses": ["short point"],
+    "grammar_issues": ["short point"],
+    "filler_words": ["word"],
+    "grammar_score": 7,
+    "confidence_score": 7
+}
+
+Use at most 3 items per list and keep every item under 15 words."""
+
+REPORT_MAP_OPTIONS = {
+    'temperature': 0.3,
+    'num_predict': 200  # Keep each map call small and bounded
+}
+
+REPORT_REDUCE_PROMPT = """You are a professional AI Interview Evaluator and Communication Coach.
+
+You are given short per-answer notes from a complete mock interview. Merge them into one
+evaluation: combine recurring strengths, weaknesses and grammar issues, and base the scores
+on the per-answer scores.
+
+Return ONLY valid JSON in this exact format:
+{
+    "interview_performance": {
+        "strengths": ["strength 1", "strength 2", "strength 3"],
+        "weaknesses": ["weakness 1", "weakness 2"],
+        "improvement_tips": ["tip 1", "tip 2", "tip 3"]
+    },
+    "grammar_analysis": {
+        "grammar_score": 8,
+        "vocabulary_level": "Intermediate",
+        "common_issues": ["issue 1", "issue 2"],
+        "improvement_suggestions": ["suggestion 1", "suggestion 2"]
+    },
+    "overall_evaluation": {
+        "interview_skills_score": 7,
+        "grammar_skills_score": 8,
+        "confidence_score": 7,
+        "overall_score": 7.3,
+        "final_verdict": "Your detailed verdict here",
+        "readiness_level": "Interview Ready / Needs Practice / Needs Significant Improvement",
+        "improvement_roadmap": ["step 1", "step 2", "step 3"]
+    }
+}
+
+Be professional, supportive, and provide actionable feedback. Never discourage the student."""
+
+# Rolling conversation summary (CONVERSATION_SUMMARY)
+SUMMARY_PROMPT = """You keep running notes on a mock interview for the interviewer.
+
+You are given the notes so far and the newest answered questions. Rewrite the notes so they
+cover everything: topics already asked about, what the candidate said (projects, skills,
+claims worth following up), strengths and gaps shown, and how the scores are trending.
+
+Write plain text, no JSON, no headings. Never exceed {max_words} words: compress older
+details rather than dropping the most recent ones."""
+
+SUMMARY_OPTIONS = {
+    'temperature': 0.2,
+    'num_predict': 400
+}
+
+class AIService:
+    def __init__(self):
+        self._transcription_backend = None  # Lazy load
+        # Ollama calls go through this breaker; while it is open requests use the fallbacks immediately
+        self.ollama_breaker = CircuitBreaker(
+            'Ollama',
+            probe=self._probe_ollama,
+            failure_threshold=getattr(settings, 'OLLAMA_BREAKER_FAILURE_THRESHOLD', 3),
+            reset_timeout=getattr(settings, 'OLLAMA_BREAKER_RESET_TIMEOUT', 30)
+        )
+        self._transcription_executor = None  # Created on first async transcription
+        self._transcription_batcher = None  # Created on first batched transcription
+        self._transcription_pool = None  # Created on first pooled transcription
+        self._tts_cache = None  # Created on first TTS request
+
+    @property
+    def transcription_backend(self):
+        """In-process speech-to-text backend chosen by TRANSCRIPTION_BACKEND (lazy loaded)"""
+        if self._transcription_backend is None:
+            backend_name = getattr(settings, 'TRANSCRIPTION_BACKEND', 'whisper')
+            print(f"Loading {backend_name} transcription model...")
+            try:
+                self._transcription_backend = load_backend(**self._transcription_backend_options())
+                print("Transcription model loaded successfully")
+            except Exception as e:
+                print(f"Error loading {backend_name}: {e}")
+                self._transcription_backend = None
+        return self._transcription_backend
+
+    def _transcription_backend_options(self):
+        return {
+            'name': getattr(settings, 'TRANSCRIPTION_BACKEND', 'whisper'),
+            'model_name': getattr(settings, 'TRANSCRIPTION_MODEL', 'base'),
+            'compute_type': getattr(settings, 'TRANSCRIPTION_COMPUTE_TYPE', None),
+        }
+    
+    def check_ollama_availability(self):
+        """Whether Ollama calls should be attempted right now (circuit breaker state; never blocks)"""
+        return self.ollama_breaker.allow_request()
+
+    async def acheck_ollama_availability(self):
+        """Async variant of check_ollama_availability"""
+        return self.ollama_breaker.allow_request()
+
+    def _probe_ollama(self):
+        """Background health probe run by the breaker when its cool-down expires"""
+        llm_client.list()
+
+    def _chat(self, **kwargs):
+        """Chat through the shared client and the circuit breaker"""
+        try:
+            response = llm_client.chat(**kwargs)
+        except (AdmissionTimeout, DeadlineExceeded):
+            # Ollama is busy or slow, not down: the caller falls back without tripping the breaker
+            raise
+        except Exception as e:
+            self.ollama_breaker.record_failure(e)
+            raise
+        self.ollama_breaker.record_success()
+        return response
+
+    async def _achat(self, **kwargs):
+        """Async chat through the shared client and the circuit breaker; with stream=True, failures mid-stream count too"""
+        try:
+            response = await llm_client.achat(**kwargs)
+        except (AdmissionTimeout, DeadlineExceeded):
+            raise
+        except Exception as e:
+            self.ollama_breaker.record_failure(e)
+            raise
+        if kwargs.get('stream'):
+            return self._abreaker_stream(response)
+        self.ollama_breaker.record_success()
+        return response
+
+    async def _abreaker_stream(self, stream):
+        try:
+            async for chunk in stream:
+                yield chunk
+        except (AdmissionTimeout, DeadlineExceeded):
+            raise
+        except Exception as e:
+            self.ollama_breaker.record_failure(e)
+            raise
+        self.ollama_breaker.record_success()
+
+    @property
+    def transcription_mode(self):
+        """'inline' (shared model), 'batched' (micro-batcher) or 'process' (worker pool)"""
+        return getattr(settings, 'TRANSCRIPTION_EXECUTOR', 'inline')
+
+    @property
+    def transcription_batcher(self):
+        """Micro-batcher that decodes concurrent uploads in one forward pass"""
+        if self._transcription_batcher is None and self.transcription_backend:
+            self._transcription_batcher = TranscriptionBatcher(
+                self.transcription_backend,
+                window_ms=getattr(settings, 'WHISPER_BATCH_WINDOW_MS', 50),
+                max_batch_size=getattr(settings, 'WHISPER_BATCH_MAX_SIZE', 8)
+            )
+        return self._transcription_batcher
+
+    @property
+    def transcription_pool(self):
+        """Worker processes with their own models; the web process never loads one"""
+        if self._transcription_pool is None:
+            options = self._transcription_backend_options()
+            self._transcription_pool = ProcessPoolTranscriber(
+                backend_name=options['name'],
+                model_name=options['model_name'],
+                compute_type=options['compute_type'],
+                workers=getattr(settings, 'WHISPER_PROCESS_WORKERS', None),
+                torch_threads=getattr(settings, 'WHISPER_TORCH_THREADS', 1)
+            )
+        return self._transcription_pool
+
+    def _submit_transcription(self, audio):
+        """Hand audio to the configured batcher or pool. Returns a Future, or None in inline mode."""
+        if self.transcription_mode == 'process':
+            return self.transcription_pool.submit(audio)
+        if self.transcription_mode == 'batched' and self.transcription_backend:
+            return self.transcription_batcher.submit(audio)
+        return None
+
+    def prepare_audio(self, audio):
+        """
+        Decode an answer and trim its silence before transcription.
+        Returns (samples, stats); stats is None if trimming is disabled or decoding failed,
+        in which case the input is returned unchanged for transcribe_audio to report on.
+        """
+        if not getattr(settings, 'VAD_TRIM_SILENCE', True):
+            return audio, None
+        try:
+            samples = load_audio(audio)
+        except Exception as e:
+            print(f"Audio decode failed, skipping silence trimming: {e}")
+            return audio, None
+        return trim_silence(
+            samples,
+            max_pause=getattr(settings, 'VAD_MAX_PAUSE_SECONDS', 1.0),
+            keep_pause=getattr(settings, 'VAD_KEEP_PAUSE_SECONDS', 0.3)
+        )
+
+    def transcribe_audio(self, audio):
+        """Transcribe an uploaded answer given as a file path, raw bytes or 16 kHz float32 array"""
+        try:
+            future = self._submit_transcription(audio)
+            if future is not None:
+                return future.result()
+            if not self.transcription_backend:
+                return "Error: Whisper model not loaded."
+            return self.transcription_backend.transcribe(load_audio(audio))
+        except Exception as e:
+            return f"Error transcribing: {str(e)}"
+
+    @property
+    def transcription_executor(self):
+        """Bounded thread pool for Whisper so blocking inference never runs on the event loop"""
+        if self._transcription_executor is None:
+            self._transcription_executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'AI_TRANSCRIPTION_WORKERS', 1),
+                thread_name_prefix='whisper'
+            )
+        return self._transcription_executor
+
+    async def atranscribe_audio(self, audio):
+        """Async variant of transcribe_audio"""
+        try:
+            # The batcher and pool run outside this process's executor; await their futures
+            # directly so concurrent requests can be in flight together
+            future = self._submit_transcription(audio)
+            if future is not None:
+                return await asyncio.wrap_future(future)
+        except Exception as e:
+            return f"Error transcribing: {str(e)}"
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.transcription_executor, self.transcribe_audio, audio)
+
+    def generate_response(self, transcript, history, topic, question_number=None, summary=None):
+        """
+        Sends transcript and history to Ollama to get feedback and next question.
+        `history` only needs the most recent turns (ending with the current answer); pass
+        `question_number` when it holds less than the whole conversation, and `summary`
+        for the rolling summary of the turns before it.
+        Returns JSON: { "feedback": str, "score": int, "next_question": str }
+        """
+        # Check if Ollama is available
+        if not self.check_ollama_availability():
+            print("Ollama not available, using fallback response")
+            return self._generate_fallback_response(transcript, history, topic, question_number)
+        
+        messages, question_number = self._build_interviewer_messages(transcript, history, topic, question_number, summary)
+
+        try:
+            response = self._chat(
+                task='interviewer',
+                messages=messages,
+                format='json',
+                options=INTERVIEWER_OPTIONS
+            )
+            result = self._parse_interviewer_result(response['message']['content'], question_number, topic)
+            result['llm_stats'] = self._interviewer_call_stats(response)
+            return result
+        except Exception as e:
+            print(f"Ollama error: {e}")
+            return self._generate_fallback_response(transcript, history, topic, question_number)
+
+    async def agenerate_response(self, transcript, history, topic, question_number=None, summary=None):
+        """
+        Async variant of generate_response for the ASGI pipeline.
+        The Ollama HTTP call runs as a coroutine, so the event loop stays free while the model generates.
+        """
+        if not await self.acheck_ollama_availability():
+            print("Ollama not available, using fallback response")
+            return self._generate_fallback_response(transcript, history, topic, question_number)
+
+        messages, question_number = self._build_interviewer_messages(transcript, history, topic, question_number, summary)
+
+        try:
+            response = await self._achat(
+                task='interviewer',
+                messages=messages,
+                format='json',
+                options=INTERVIEWER_OPTIONS
+            )
+            result = self._parse_interviewer_result(response['message']['content'], question_number, topic)
+            result['llm_stats'] = self._interviewer_call_stats(response)
+            return result
+        except Exception as e:
+            print(f"Ollama error: {e}")
+            return self._generate_fallback_response(transcript, history, topic, question_number)
+
+    async def astream_response(self, transcript, history, topic, question_number=None, summary=None):
+        """
+        Streaming variant of agenerate_response.
+
+        Yields ('feedback', text) as feedback tokens arrive from Ollama's streaming chat,
+        then a single ('result', dict) with the validated feedback, score and next question.
+        """
+        if not await self.acheck_ollama_availability():
+            print("Ollama not available, using fallback response")
+            result = self._generate_fallback_response(transcript, history, topic, question_number)
+            yield 'feedback', result['feedback']
+            yield 'result', result
+            return
+
+        messages, question_number = self._build_interviewer_messages(transcript, history, topic, question_number, summary)
+        feedback_stream = JSONStringFieldStream('feedback')
+        content = ''
+        streamed_feedback = False
+
+        try:
+            stream = await self._achat(
+                task='interviewer',
+                messages=messages,
+                format='json',
+                options=INTERVIEWER_OPTIONS,
+                stream=True
+            )
+            async for chunk in stream:
+                last_chunk = chunk  # The final chunk carries the token counts and timings
+                token = chunk['message']['content']
+                content += token
+                delta = feedback_stream.feed(token)
+                if delta:
+                    streamed_feedback = True
+                    yield 'feedback', delta
+            result = self._parse_interviewer_result(content, question_number, topic)
+            result['llm_stats'] = self._interviewer_call_stats(last_chunk)
+        except Exception as e:
+            print(f"Ollama error: {e}")
+            result = self._generate_fallback_response(transcript, history, topic, question_number)
+            streamed_feedback = False
+
+        if not streamed_feedback:
+            yield 'feedback', result['feedback']
+        yield 'result', result
+
+    @property
+    def interviewer_prompt_variant(self):
+        """'full' (default) or 'compact' interviewer prompt, from INTERVIEWER_PROMPT"""
+        return getattr(settings, 'INTERVIEWER_PROMPT', 'full')
+
+    def _interviewer_call_stats(self, response):
+        """Ollama's token counts and timings for an interviewer call, tagged with the prompt variant"""
+        return {**call_stats(response), 'prompt_variant': self.interviewer_prompt_variant}
+
+    def _build_interviewer_messages(self, transcript, history, topic, question_number=None, summary=None):
+        """Build the chat messages for an interviewer turn. Returns (messages, question_number)."""
+        if question_number is None:
+            question_number = len(history) + 1
+        
+        # Determine role category for specialized evaluation
+        role_category = self._determine_role_category(topic)
+
+        if self.interviewer_prompt_variant == 'compact':
+            system_prompt = INTERVIEWER_SYSTEM_PROMPT_COMPACT
+            stage = INTERVIEW_STAGES[min(max(question_number, 1), len(INTERVIEW_STAGES)) - 1]
+            guidelines = f"Stage {question_number} of 10-12: {stage}, for a {topic}."
+        else:
+            system_prompt = INTERVIEWER_SYSTEM_PROMPT
+            guidelines = self._get_question_guidelines(question_number, role_category, topic)
+
         messages = [{'role': 'system', 'content': system_prompt}]
+        if summary:
+            messages.append({'role': 'user', 'content': f"INTERVIEW SO FAR (summary of the earlier answers):\n{summary}"})
         
         # Add conversation history with detailed context
         for idx, turn in enumerate(history[-4:], 1):
@@ -263,7 +620,14 @@ Remember:
         current_question = history[-1]['question'] if history else "Tell me about yourself"
         messages.append({
             'role': 'user', 
-            'content': f"""CURRENT QUESTION: "{current_question}"
+            'content': f"""ROLE CONTEXT: {topic}
+ROLE CATEGORY: {role_category}
+QUESTION NUMBER: {question_number}
+
+QUESTION GUIDELINES (question {question_number}, {role_category}):
+{guidelines}
+
+CURRENT QUESTION: "{current_question}"
 
 CANDIDATE'S ANSWER: "{transcript}"
 
@@ -272,66 +636,67 @@ WORD COUNT: {len(transcript.split())} words
 Now provide your thorough evaluation following ALL the guidelines above. Be specific, honest, and professional."""
         })
 
-        try:
-            response = ollama.chat(
-                model='llama3', 
-                messages=messages, 
-                format='json',
-                options={
-                    'temperature': 0.7,  # Balanced creativity
-                    'top_p': 0.9,
-                    'num_predict': 500  # Allow longer responses
-                }
-            )
-            content = response['message']['content']
-            result = json.loads(content)
-            
-            # Validate and ensure quality
-            if 'score' in result:
-                result['score'] = max(1, min(10, int(result['score'])))
-            
-            if 'feedback' not in result or len(result['feedback']) < 20:
-                result['feedback'] = "Your answer needs more detail and specific examples to demonstrate your knowledge."
-            
-            if 'next_question' not in result or len(result['next_question']) < 10:
-                result['next_question'] = self._get_fallback_question(question_number, topic)
-            
-            return result
-        except Exception as e:
-            print(f"Ollama error: {e}")
-            self._ollama_available = None
-            return self._generate_fallback_response(transcript, history, topic)
+        return messages, question_number
+
+    def _parse_interviewer_result(self, content, question_number, topic):
+        """Parse and validate the JSON produced by the interviewer model"""
+        result = json.loads(content)
+        
+        # Validate and ensure quality
+        if 'score' in result:
+            result['score'] = max(1, min(10, int(result['score'])))
+        
+        if 'feedback' not in result or len(result['feedback']) < 20:
+            result['feedback'] = "Your answer needs more detail and specific examples to demonstrate your knowledge."
+        
+        if 'next_question' not in result or len(result['next_question']) < 10:
+            result['next_question'] = self._get_fallback_question(question_number, topic)
+        
+        return result
     
+    def summarise_conversation(self, summary, turns, topic):
+        """
+        Fold newly answered turns into a session's rolling summary.
+        `turns` are dicts with number, question, answer and score. Without Ollama the
+        summary is extended with compact extractive notes, so it stays bounded either way.
+        """
+        max_words = getattr(settings, 'CONVERSATION_SUMMARY_MAX_WORDS', 180)
+        if self.check_ollama_availability():
+            new_turns = "\n\n".join(
+                f"Q{turn['number']}: {turn['question']}\nAnswer: {turn['answer']}\nScore: {turn['score']}/10"
+                for turn in turns
+            )
+            messages = [
+                {'role': 'system', 'content': SUMMARY_PROMPT.format(max_words=max_words)},
+                {'role': 'user', 'content': f"Role: {topic}\n\nNotes so far:\n{summary or '(none)'}\n\nNewest answers:\n\n{new_turns}"}
+            ]
+            try:
+                response = self._chat(task='summary', messages=messages, options=SUMMARY_OPTIONS)
+                words = response['message']['content'].split()
+                if words:
+                    return ' '.join(words[:max_words])
+            except Exception as e:
+                print(f"Summary error: {e}")
+        return self._fallback_summary(summary, turns, max_words)
+
+    def _fallback_summary(self, summary, turns, max_words):
+        lines = [line for line in (summary or '').splitlines() if line.strip()]
+        for turn in turns:
+            answer = ' '.join((turn['answer'] or '').split()[:25])
+            lines.append(f"Q{turn['number']} ({turn['score']}/10) {turn['question']} -> {answer}")
+        # Over budget: drop the oldest notes first
+        while len(lines) > 1 and sum(len(line.split()) for line in lines) > max_words:
+            lines.pop(0)
+        return '\n'.join(lines)
+
+    def opening_question(self, topic):
+        """Role-specific opening question for a new session"""
+        role = classify(topic)
+        return question_bank.opening(role.category, role.tech, topic)
+
     def _determine_role_category(self, topic):
         """Determine the category of the role for specialized handling"""
-        topic_lower = topic.lower()
-        
-        if any(kw in topic_lower for kw in ['python', 'java', 'c++', 'javascript', 'developer', 'programmer', 'software engineer']):
-            return "Software Development"
-        elif any(kw in topic_lower for kw in ['data scientist', 'data analyst', 'machine learning', 'ai', 'ml']):
-            return "Data Science & Analytics"
-        elif any(kw in topic_lower for kw in ['web', 'frontend', 'backend', 'fullstack', 'react', 'angular', 'node']):
-            return "Web Development"
-        elif any(kw in topic_lower for kw in ['devops', 'cloud', 'aws', 'azure', 'kubernetes', 'docker']):
-            return "DevOps & Cloud"
-        elif any(kw in topic_lower for kw in ['qa', 'test', 'quality assurance', 'automation']):
-            return "Quality Assurance"
-        elif any(kw in topic_lower for kw in ['mobile', 'android', 'ios', 'flutter', 'react native']):
-            return "Mobile Development"
-        elif any(kw in topic_lower for kw in ['database', 'sql', 'dba', 'mongodb', 'postgresql']):
-            return "Database Administration"
-        elif any(kw in topic_lower for kw in ['security', 'cybersecurity', 'penetration', 'ethical hacking']):
-            return "Cybersecurity"
-        elif any(kw in topic_lower for kw in ['ui', 'ux', 'design', 'graphic']):
-            return "UI/UX Design"
-        elif any(kw in topic_lower for kw in ['project manager', 'scrum', 'agile', 'product manager']):
-            return "Project Management"
-        elif any(kw in topic_lower for kw in ['business analyst', 'ba', 'requirements']):
-            return "Business Analysis"
-        elif any(kw in topic_lower for kw in ['network', 'cisco', 'routing', 'switching']):
-            return "Network Engineering"
-        else:
-            return "General Technical"
+        return classify(topic).category
     
     def _get_question_guidelines(self, question_number, role_category, topic):
         """Get specific guidelines for question generation based on interview stage - REAL INTERVIEWER STYLE"""
@@ -631,222 +996,25 @@ Thank them for their time. Make them feel valued."""
     
     def _get_fallback_question(self, question_number, topic):
         """Get a fallback question if AI fails to generate one"""
-        fallback_questions = [
-            f"Tell me about your experience with {topic}.",
-            f"What interests you most about {topic}?",
-            f"Can you describe a project you've worked on related to {topic}?",
-            "What are your greatest strengths?",
-            "How do you handle challenging situations?",
-            "Where do you see yourself in 5 years?",
-            "Why should we hire you?",
-            "Do you have any questions for us?"
-        ]
-        return fallback_questions[min(question_number - 1, len(fallback_questions) - 1)]
+        return question_bank.generic_question(question_number, topic)
+    
+    def _generic_fallback_questions(self, topic):
+        """Role-agnostic questions used when the AI response has no usable next question"""
+        return question_bank.generic_questions(topic)
     
-    def _generate_fallback_response(self, transcript, history, topic):
+    def _fallback_question_bank(self, topic):
+        """Ordered fallback questions for a topic, used when Ollama is not available"""
+        role = classify(topic)
+        return question_bank.questions(role.category, role.tech, topic)
+    
+    def _generate_fallback_response(self, transcript, history, topic, question_number=None):
         """Generate a highly accurate response when Ollama is not available"""
-        question_count = len(history) + 1
-        role_category = self._determine_role_category(topic)
-        
-        # Comprehensive role-specific question banks
-        role_questions = {
-            "Software Development": {
-                "python": [
-                    "Tell me about yourself and your experience with Python programming.",
-                    "What are the key differences between lists, tuples, and sets in Python?",
-                    "Explain how Python handles memory management and garbage collection.",
-                    "Describe a challenging Python project you've worked on and how you approached it.",
-                    "What Python libraries and frameworks are you most comfortable with?",
-                    "How do you debug and optimize Python code for better performance?",
-                    "Tell me about a time when you had to learn a new Python concept quickly.",
-                    "Where do you see yourself growing as a Python developer?"
-                ],
-                "java": [
-                    "Tell me about yourself and your Java programming experience.",
-                    "Explain the difference between abstract classes and interfaces in Java.",
-                    "What are the four pillars of Object-Oriented Programming? Explain each.",
-                    "Describe a complex Java application you've built. What challenges did you face?",
-                    "How does Java handle memory management? Explain the garbage collector.",
-                    "What Java frameworks have you worked with? Describe your experience.",
-                    "How do you approach exception handling in Java applications?",
-                    "What are your career goals as a Java developer?"
-                ],
-                "javascript": [
-                    "Tell me about yourself and your JavaScript experience.",
-                    "Explain the difference between var, let, and const in JavaScript.",
-                    "What is the event loop in JavaScript and how does it work?",
-                    "Describe a JavaScript project you're proud of. What made it challenging?",
-                    "How do you handle asynchronous operations in JavaScript?",
-                    "What JavaScript frameworks or libraries are you proficient in?",
-                    "How do you debug JavaScript code in production?",
-                    "Where do you see JavaScript development heading in the next few years?"
-                ],
-                "general": [
-                    f"Tell me about yourself and your interest in {topic}.",
-                    f"What programming languages are you most comfortable with for {topic}?",
-                    f"Describe a technical challenge you faced and how you solved it.",
-                    f"How do you stay updated with the latest trends in {topic}?",
-                    "What's your approach to writing clean, maintainable code?",
-                    "Tell me about a time you had to debug a difficult issue.",
-                    "How do you handle code reviews and feedback?",
-                    "What are your long-term career goals in software development?"
-                ]
-            },
-            "Data Science & Analytics": [
-                "Tell me about yourself and your interest in data science.",
-                "What data analysis tools and programming languages do you know?",
-                "Explain the difference between supervised and unsupervised learning.",
-                "How would you approach cleaning and preparing a messy dataset?",
-                "Describe a data analysis project you've completed. What insights did you find?",
-                "What statistical concepts are you most comfortable with?",
-                "How do you choose the right visualization for different types of data?",
-                "What machine learning algorithms have you worked with?",
-                "How do you validate the accuracy of your models?",
-                "Where do you see yourself growing in the data science field?"
-            ],
-            "Web Development": [
-                "Tell me about yourself and your web development experience.",
-                "What's the difference between frontend and backend development?",
-                "Which web technologies and frameworks are you most proficient in?",
-                "Describe a website or web application you've built from scratch.",
-                "How do you ensure your websites are responsive across different devices?",
-                "Explain how you would optimize a slow-loading website.",
-                "What's your approach to debugging web applications?",
-                "How do you handle browser compatibility issues?",
-                "What are the latest web development trends you're excited about?",
-                "Where do you see your career in web development going?"
-            ],
-            "DevOps & Cloud": [
-                "Tell me about yourself and your experience with DevOps practices.",
-                "Explain the concept of CI/CD and why it's important.",
-                "What's the difference between Docker and Kubernetes?",
-                "Describe your experience with cloud platforms like AWS, Azure, or GCP.",
-                "How do you approach infrastructure as code?",
-                "Tell me about a time you automated a manual process. What was the impact?",
-                "How do you monitor and troubleshoot production systems?",
-                "What's your experience with version control and Git workflows?",
-                "How do you ensure security in DevOps pipelines?",
-                "What are your goals in the DevOps and cloud space?"
-            ],
-            "Quality Assurance": [
-                "Tell me about yourself and your experience in quality assurance.",
-                "What's the difference between manual and automated testing?",
-                "Which testing tools and frameworks have you worked with?",
-                "Describe your approach to creating comprehensive test cases.",
-                "How do you prioritize which tests to automate first?",
-                "Tell me about a critical bug you found. How did you discover it?",
-                "What's your experience with different types of testing (unit, integration, E2E)?",
-                "How do you ensure test coverage is adequate?",
-                "How do you communicate testing results to developers and stakeholders?",
-                "Where do you see the future of QA and testing?"
-            ],
-            "Mobile Development": [
-                "Tell me about yourself and your mobile development experience.",
-                "What mobile platforms have you developed for (iOS, Android, cross-platform)?",
-                "Explain the mobile app lifecycle and its key stages.",
-                "Describe a mobile app you've built. What challenges did you face?",
-                "How do you handle different screen sizes and resolutions?",
-                "What's your approach to mobile app performance optimization?",
-                "How do you test mobile applications across different devices?",
-                "What mobile development frameworks are you familiar with?",
-                "How do you handle offline functionality in mobile apps?",
-                "What are your career aspirations in mobile development?"
-            ],
-            "Database Administration": [
-                "Tell me about yourself and your database experience.",
-                "Explain database normalization and why it's important.",
-                "What's the difference between SQL and NoSQL databases?",
-                "Describe your experience with database design and schema creation.",
-                "How do you optimize slow database queries?",
-                "What's your approach to database backup and recovery?",
-                "Tell me about a time you had to troubleshoot a database performance issue.",
-                "How do you ensure database security and access control?",
-                "What database management systems are you most comfortable with?",
-                "Where do you see yourself growing as a database professional?"
-            ],
-            "Cybersecurity": [
-                "Tell me about yourself and your interest in cybersecurity.",
-                "Explain the CIA triad in information security.",
-                "What are the most common web application vulnerabilities?",
-                "Describe your experience with security tools and technologies.",
-                "How would you approach securing a web application?",
-                "Tell me about a security incident you've investigated or heard about.",
-                "What's your understanding of encryption and cryptography?",
-                "How do you stay updated with the latest security threats?",
-                "What certifications or training do you have in cybersecurity?",
-                "What are your career goals in the security field?"
-            ],
-            "UI/UX Design": [
-                "Tell me about yourself and your design background.",
-                "What's the difference between UI and UX design?",
-                "Which design tools are you most proficient in?",
-                "Describe your design process from concept to final product.",
-                "How do you conduct user research and incorporate feedback?",
-                "Show me a design project you're proud of. What made it successful?",
-                "How do you ensure your designs are accessible to all users?",
-                "What design principles do you follow?",
-                "How do you handle design feedback and criticism?",
-                "Where do you see design trends heading?"
-            ],
-            "Project Management": [
-                "Tell me about yourself and your project management experience.",
-                "Explain the difference between Agile and Waterfall methodologies.",
-                "Describe a project you managed from start to finish.",
-                "How do you handle project scope creep?",
-                "What's your approach to stakeholder management?",
-                "Tell me about a time a project went off track. How did you handle it?",
-                "How do you prioritize tasks and manage resources?",
-                "What project management tools do you use?",
-                "How do you measure project success?",
-                "What are your goals as a project manager?"
-            ],
-            "Business Analysis": [
-                "Tell me about yourself and your experience as a business analyst.",
-                "How do you gather and document business requirements?",
-                "What techniques do you use for requirements elicitation?",
-                "Describe a complex business problem you helped solve.",
-                "How do you bridge the gap between business and technical teams?",
-                "What tools do you use for business analysis?",
-                "Tell me about a time stakeholders had conflicting requirements.",
-                "How do you validate that requirements are complete and accurate?",
-                "What's your experience with process modeling and improvement?",
-                "Where do you see your career in business analysis going?"
-            ],
-            "Network Engineering": [
-                "Tell me about yourself and your networking experience.",
-                "Explain the OSI model and its seven layers.",
-                "What's the difference between TCP and UDP?",
-                "Describe your experience with network design and implementation.",
-                "How do you troubleshoot network connectivity issues?",
-                "What networking protocols are you most familiar with?",
-                "Tell me about a complex network problem you solved.",
-                "How do you ensure network security?",
-                "What certifications do you have (CCNA, CCNP, etc.)?",
-                "What are your career goals in network engineering?"
-            ]
-        }
-        
-        # Select appropriate question set
-        topic_lower = topic.lower()
-        questions = None
-        
-        # Try to match specific technology first
-        if "python" in topic_lower:
-            questions = role_questions["Software Development"]["python"]
-        elif "java" in topic_lower:
-            questions = role_questions["Software Development"]["java"]
-        elif "javascript" in topic_lower or "js" in topic_lower:
-            questions = role_questions["Software Development"]["javascript"]
-        elif role_category in role_questions:
-            if isinstance(role_questions[role_category], dict):
-                questions = role_questions[role_category]["general"]
-            else:
-                questions = role_questions[role_category]
-        else:
-            questions = role_questions["Software Development"]["general"]
+        question_count = question_number or len(history) + 1
+        role = classify(topic)
+        role_category = role.category
         
         # Get next question
-        next_question = questions[min(question_count - 1, len(questions) - 1)]
+        next_question = question_bank.question(role_category, role.tech, question_count, topic)
         
         # Advanced scoring based on multiple factors
         answer_words = transcript.split()
@@ -915,21 +1083,7 @@ Thank them for their time. Make them feel valued."""
     
     def _get_technical_keywords(self, role_category, topic):
         """Get technical keywords for scoring based on role"""
-        keywords = {
-            "Software Development": ['code', 'function', 'class', 'algorithm', 'data structure', 'api', 'framework', 'library', 'debug', 'test', 'deploy', 'git', 'version control'],
-            "Data Science & Analytics": ['data', 'analysis', 'model', 'algorithm', 'statistics', 'visualization', 'pandas', 'numpy', 'machine learning', 'dataset', 'feature', 'prediction'],
-            "Web Development": ['html', 'css', 'javascript', 'frontend', 'backend', 'api', 'responsive', 'framework', 'react', 'angular', 'vue', 'node', 'database'],
-            "DevOps & Cloud": ['docker', 'kubernetes', 'ci/cd', 'pipeline', 'deployment', 'cloud', 'aws', 'azure', 'infrastructure', 'automation', 'monitoring'],
-            "Quality Assurance": ['test', 'testing', 'automation', 'bug', 'quality', 'selenium', 'junit', 'integration', 'regression', 'test case'],
-            "Mobile Development": ['mobile', 'app', 'android', 'ios', 'react native', 'flutter', 'ui', 'responsive', 'performance', 'api'],
-            "Database Administration": ['database', 'sql', 'query', 'table', 'index', 'normalization', 'backup', 'recovery', 'performance', 'optimization'],
-            "Cybersecurity": ['security', 'vulnerability', 'encryption', 'authentication', 'authorization', 'firewall', 'penetration', 'threat', 'risk'],
-            "UI/UX Design": ['design', 'user', 'interface', 'experience', 'wireframe', 'prototype', 'usability', 'accessibility', 'figma', 'sketch'],
-            "Project Management": ['project', 'agile', 'scrum', 'stakeholder', 'timeline', 'budget', 'risk', 'resource', 'deliverable'],
-            "Business Analysis": ['requirements', 'stakeholder', 'process', 'analysis', 'documentation', 'workflow', 'business', 'solution'],
-            "Network Engineering": ['network', 'router', 'switch', 'protocol', 'tcp', 'ip', 'firewall', 'vpn', 'bandwidth', 'latency']
-        }
-        return keywords.get(role_category, [])
+        return question_bank.keywords(role_category)
 
     def generate_comprehensive_report(self, session_data):
         """
@@ -960,6 +1114,9 @@ Thank them for their time. Make them feel valued."""
             print("Ollama not available, using fallback report")
             return self._generate_fallback_report(session_data)
         
+        if getattr(settings, 'REPORT_MODE', 'single') == 'map_reduce':
+            return self._generate_map_reduce_report(session_data)
+        
         system_prompt = """You are a professional AI Interview Evaluator and Communication Coach.
 
 Your task is to analyze a complete mock interview and generate a detailed evaluation report.
@@ -1028,29 +1185,95 @@ Be professional, supportive, and provide actionable feedback. Never discourage t
         ]
 
         try:
-            response = ollama.chat(model='llama3', messages=messages, format='json')
+            response = self._chat(task='report', messages=messages, format='json')
             content = response['message']['content']
             evaluation = json.loads(content)
             
             # Add metadata
-            evaluation['metadata'] = {
-                'student_name': session_data.get('student_name', 'Student'),
-                'topic': session_data.get('topic', 'General'),
-                'interview_type': session_data.get('interview_type', 'General'),
-                'date': datetime.now().strftime('%B %d, %Y'),
-                'total_questions': len(session_data.get('responses', [])),
-                'average_score': sum(r.get('score', 0) for r in session_data.get('responses', [])) / max(len(session_data.get('responses', [])), 1)
-            }
+            evaluation['metadata'] = self._report_metadata(session_data)
             
             return evaluation
             
         except Exception as e:
             print(f"Report generation error: {e}")
-            # Reset availability flag to recheck next time
-            self._ollama_available = None
             # Return fallback report
             return self._generate_fallback_report(session_data)
 
+    def _report_metadata(self, session_data):
+        responses = session_data.get('responses', [])
+        return {
+            'student_name': session_data.get('student_name', 'Student'),
+            'topic': session_data.get('topic', 'General'),
+            'interview_type': session_data.get('interview_type', 'General'),
+            'date': datetime.now().strftime('%B %d, %Y'),
+            'total_questions': len(responses),
+            'average_score': sum(r.get('score', 0) for r in responses) / max(len(responses), 1)
+        }
+
+    def _analyse_answer(self, index, response):
+        """Map step: short structured analysis of a single answer"""
+        messages = [
+            {'role': 'system', 'content': REPORT_MAP_PROMPT},
+            {'role': 'user', 'content': (
+                f"Q{index}: {response.get('question', '')}\n"
+                f"A{index}: {response.get('answer', '')}\n"
+                f"Score: {response.get('score', 0)}/10"
+            )}
+        ]
+        response = self._chat(task='report_map', messages=messages, format='json', options=REPORT_MAP_OPTIONS)
+        return json.loads(response['message']['content'])
+
+    def _generate_map_reduce_report(self, session_data):
+        """
+        Report generation for long sessions: every answer is analysed by its own small,
+        bounded call (REPORT_MAP_PARALLELISM at a time), then one short reduce call merges
+        the per-answer notes into the report schema. Latency is roughly the slowest
+        answer plus the reduce, instead of one call over the whole transcript.
+
+        Parallelism is capped at OLLAMA_MAX_CONCURRENCY: the report_map deadline includes
+        queueing, so map calls waiting behind each other for a slot would miss it.
+        """
+        responses = session_data.get('responses', [])
+        parallelism = max(1, min(getattr(settings, 'REPORT_MAP_PARALLELISM', 4), llm_client.limiter.limit))
+
+        def analyse(item):
+            """(analysis, whether the answer's stored feedback stood in for it)"""
+            index, response = item
+            if not self.check_ollama_availability():
+                return {'feedback': response.get('feedback', '')}, True
+            try:
+                return self._analyse_answer(index, response), False
+            except Exception as e:
+                # One bad answer shouldn't sink the report; its stored feedback stands in
+                print(f"Answer analysis error (Q{index}): {e}")
+                return {'feedback': response.get('feedback', '')}, True
+
+        with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix='report-map') as executor:
+            results = list(executor.map(analyse, enumerate(responses, 1)))
+        analyses = [analysis for analysis, _ in results]
+        fallbacks = sum(fell_back for _, fell_back in results)
+        if fallbacks:
+            print(f"Report map step: {fallbacks} of {len(responses)} answers used their stored feedback")
+
+        notes = f"Interview Topic: {session_data.get('topic', 'General')}\n"
+        notes += f"Interview Type: {session_data.get('interview_type', 'General')}\n\n"
+        for idx, (response, analysis) in enumerate(zip(responses, analyses), 1):
+            notes += f"Q{idx} (score {response.get('score', 0)}/10): {json.dumps(analysis)}\n"
+
+        messages = [
+            {'role': 'system', 'content': REPORT_REDUCE_PROMPT},
+            {'role': 'user', 'content': f"Per-answer notes:\n\n{notes}"}
+        ]
+
+        try:
+            response = self._chat(task='report', messages=messages, format='json')
+            evaluation = json.loads(response['message']['content'])
+            evaluation['metadata'] = self._report_metadata(session_data)
+            return evaluation
+        except Exception as e:
+            print(f"Report generation error: {e}")
+            return self._generate_fallback_report(session_data)
+
     def _generate_fallback_report(self, session_data):
         """Generate a basic report if AI fails"""
         responses = session_data.get('responses', [])
@@ -1083,44 +1306,141 @@ Be professional, supportive, and provide actionable feedback. Never discourage t
                 'interview_type': session_data.get('interview_type', 'General'),
                 'date': datetime.now().strftime('%B %d, %Y'),
                 'total_questions': len(responses),
-                'average_score': round(avg_score, 1)
+                'average_score': round(avg_score, 1),
+                'fallback': True
             }
         }
 
     async def _generate_tts_async(self, text, output_path):
         """Async helper for Edge-TTS"""
-        communicate = edge_tts.Communicate(text, "en-US-AriaNeural")
+        communicate = edge_tts.Communicate(text, TTS_VOICE)
         await communicate.save(output_path)
 
-    def text_to_speech(self, text, output_filename=None):
+    @property
+    def tts_cache(self):
+        """Content-addressed store for synthesised speech under MEDIA_ROOT/tts"""
+        if self._tts_cache is None:
+            self._tts_cache = TTSCache(
+                os.path.join(settings.MEDIA_ROOT, "tts"),
+                f"{settings.MEDIA_URL.rstrip('/')}/tts",
+                max_bytes=getattr(settings, 'TTS_CACHE_MAX_BYTES', 512 * 1024 * 1024)
+            )
+        return self._tts_cache
+
+    def cached_speech_url(self, text):
+        """URL of already-synthesised audio for `text`, or None if it hasn't been rendered yet"""
+        cache = self.tts_cache
+        key = cache.key(text, TTS_VOICE)
+        if cache.get(key) is None:
+            return None
+        return cache.url(key)
+
+    def text_to_speech(self, text):
         """
         Converts text to speech using Edge-TTS (online, free, high quality).
+        Identical text is only synthesised once; later calls return the cached file's URL.
         """
         if not text or not str(text).strip():
             return None
 
-        # Sanitize and prepare path
-        safe_name = f"tts_{uuid.uuid4().hex}"
-        if output_filename:
-            safe_name = os.path.basename(output_filename).replace(" ", "_")
-        
-        output_dir = os.path.join(settings.MEDIA_ROOT, "tts")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        filename = f"{safe_name}.mp3"
-        file_path = os.path.join(output_dir, filename)
+        cache = self.tts_cache
+        key = cache.key(text, TTS_VOICE)
+        if cache.get(key) is not None:
+            return cache.url(key)
 
+        temp_path = cache.temp_path(key)
         try:
             # Run async function in sync context
-            async_to_sync(self._generate_tts_async)(text, file_path)
+            async_to_sync(self._generate_tts_async)(text, temp_path)
+            cache.commit(key, temp_path)
             
             # Return URL
-            media_url = f"{settings.MEDIA_URL.rstrip('/')}/tts/{filename}"
-            return media_url
+            return cache.url(key)
         except Exception as e:
             print(f"Edge-TTS error: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+
+    async def atext_to_speech(self, text):
+        """Async variant of text_to_speech; awaits Edge-TTS directly on the running loop"""
+        if not text or not str(text).strip():
             return None
 
+        cache = self.tts_cache
+        key = cache.key(text, TTS_VOICE)
+        if cache.get(key) is not None:
+            return cache.url(key)
+
+        temp_path = cache.temp_path(key)
+        try:
+            await self._generate_tts_async(text, temp_path)
+            cache.commit(key, temp_path)
+            return cache.url(key)
+        except Exception as e:
+            print(f"Edge-TTS error: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+
+    def static_questions(self, topic):
+        """
+        Every question for `topic` that is known ahead of time (not generated by the LLM):
+        the opening question, the fallback bank and the generic fallback questions.
+        """
+        texts = [self.opening_question(topic)]
+        texts.extend(self._fallback_question_bank(topic))
+        texts.extend(self._generic_fallback_questions(topic))
+        return list(dict.fromkeys(texts))
+
+    def split_sentences(self, text):
+        """Split text into sentences for pipelined synthesis"""
+        return [sentence for sentence in SENTENCE_BOUNDARY.split(str(text).strip()) if sentence]
+
+    async def astream_speech(self, text):
+        """
+        Pipelined Edge-TTS: yields MP3 bytes for `text` in order while later sentences are still rendering.
+
+        Every sentence is synthesised concurrently (bounded by TTS_PIPELINE_CONCURRENCY) and
+        the first sentence's audio is yielded as soon as it arrives, cutting time-to-first-audio
+        for long questions. MP3 frames concatenate cleanly, so the output plays as one file.
+        When every sentence rendered, the full file is stored in the TTS cache so later
+        requests are served from disk.
+        """
+        sentences = self.split_sentences(text)
+        semaphore = asyncio.Semaphore(getattr(settings, 'TTS_PIPELINE_CONCURRENCY', 4))
+        queues = [asyncio.Queue() for _ in sentences]
+        failed = False
+
+        async def render(sentence, queue):
+            nonlocal failed
+            try:
+                async with semaphore:
+                    communicate = edge_tts.Communicate(sentence, TTS_VOICE)
+                    async for chunk in communicate.stream():
+                        if chunk['type'] == 'audio':
+                            queue.put_nowait(chunk['data'])
+            except Exception as e:
+                print(f"Edge-TTS error: {e}")
+                failed = True
+            finally:
+                queue.put_nowait(None)
+
+        # Tasks are created in sentence order, so the first sentence gets the first slot
+        tasks = [asyncio.create_task(render(sentence, queue)) for sentence, queue in zip(sentences, queues)]
+        audio = bytearray()
+        try:
+            for queue in queues:
+                while (data := await queue.get()) is not None:
+                    audio.extend(data)
+                    yield data
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if audio and not failed:
+            self.tts_cache.put(self.tts_cache.key(text, TTS_VOICE), bytes(audio))
+
 
 # Singleton instance shared across the app to avoid reloading heavy models.
 ai_service = AIService()
@@ -5,10 +5,13 @@ class InterviewCoreConfig(AppConfig):
     name = 'interview_core'
 
     def ready(self):
-        # Warm the Whisper model at startup so the first request doesn't block on loading.
+        # Warm the transcription model at startup so the first request doesn't block on loading.
         from .ai_service import ai_service
+        if ai_service.transcription_mode == 'process':
+            # Worker processes load their own models; keep the web process light.
+            return
         try:
-            _ = ai_service.whisper_model
+            _ = ai_service.transcription_backend
         except Exception as exc:
             # Don't crash the server if the model fails to load; log and continue.
-            print(f"[InterviewCore] Whisper warmup failed: {exc}")
+            print(f"[InterviewCore] Transcription warmup failed: {exc}")
@@ -0,0 +1,151 @@
+"""
+In-process audio decoding and silence trimming for uploaded answers.
+
+The browser uploads webm/ogg (Opus) or wav. Decoding those bytes here, straight into a
+16 kHz mono float32 array, saves Whisper's ffmpeg subprocess and the round-trip through
+the saved file on every answer. trim_silence then drops the silence around and inside
+the answer before it reaches the model.
+"""
+import io
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def decode_audio(data, sample_rate=SAMPLE_RATE):
+    """
+    Decode audio bytes to a mono float32 array at `sample_rate`.
+
+    soundfile (libsndfile) handles wav/flac/ogg; PyAV (bundled FFmpeg libraries, no
+    subprocess) handles webm/Opus and anything else the browser sends.
+    """
+    try:
+        samples, source_rate = _decode_soundfile(data)
+    except Exception:
+        samples, source_rate = _decode_av(data, sample_rate)
+    return resample(samples, source_rate, sample_rate)
+
+
+def _decode_soundfile(data):
+    import soundfile as sf
+    samples, source_rate = sf.read(io.BytesIO(data), dtype='float32', always_2d=True)
+    return samples.mean(axis=1), source_rate
+
+
+def _decode_av(data, sample_rate):
+    import av
+    chunks = []
+    with av.open(io.BytesIO(data)) as container:
+        stream = container.streams.audio[0]
+        # Let libswresample downmix and resample while decoding
+        resampler = av.AudioResampler(format='flt', layout='mono', rate=sample_rate)
+        for frame in container.decode(stream):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+        for resampled in resampler.resample(None):
+            chunks.append(resampled.to_ndarray().reshape(-1))
+    if not chunks:
+        return np.zeros(0, dtype=np.float32), sample_rate
+    return np.concatenate(chunks), sample_rate
+
+
+def resample(samples, source_rate, target_rate=SAMPLE_RATE):
+    """
+    Resample to `target_rate` with libswresample (through PyAV), whose filter low-passes
+    below the new Nyquist frequency so content above it doesn't alias into the speech band.
+    """
+    import av
+    samples = np.asarray(samples, dtype=np.float32)
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+
+    frame = av.AudioFrame.from_ndarray(samples.reshape(1, -1), format='flt', layout='mono')
+    frame.sample_rate = source_rate
+    resampler = av.AudioResampler(format='flt', layout='mono', rate=target_rate)
+    chunks = [resampled.to_ndarray().reshape(-1) for resampled in resampler.resample(frame)]
+    chunks += [resampled.to_ndarray().reshape(-1) for resampled in resampler.resample(None)]
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks)
+
+
+def trim_silence(samples, sample_rate=SAMPLE_RATE, frame_ms=30, max_pause=1.0, keep_pause=0.3, min_pause=0.3):
+    """
+    Energy-based voice activity trimming.
+
+    Cuts leading and trailing silence and shortens internal pauses longer than
+    `max_pause` seconds to `keep_pause` seconds, so the model only spends compute on
+    speech. Returns (trimmed_samples, stats) where stats records the silence removed
+    and the pauses found (those of at least `min_pause` seconds). Audio with no
+    detectable speech is returned unchanged.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    frame_seconds = frame_length / sample_rate
+    n_frames = len(samples) // frame_length
+    duration = len(samples) / sample_rate
+    stats = {
+        'duration': round(duration, 2),
+        'speech_duration': 0.0,
+        'trimmed_duration': round(duration, 2),
+        'leading_silence': 0.0,
+        'trailing_silence': 0.0,
+        'pause_count': 0,
+        'longest_pause': 0.0,
+        'total_pause': 0.0,
+        'removed_pause': 0.0,
+    }
+    if n_frames == 0:
+        return samples, stats
+
+    # Frame energy in dBFS
+    frames = samples[:n_frames * frame_length].reshape(n_frames, frame_length)
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+
+    # Adaptive threshold: a margin above the noise floor, but well below the loudest speech
+    noise_floor = np.percentile(energy_db, 10)
+    peak = energy_db.max()
+    threshold = max(-50.0, min(noise_floor + 12.0, peak - 20.0))
+    voiced = energy_db > threshold
+
+    # Hangover: keep ~150 ms around voiced frames so word onsets and tails survive
+    hangover = max(1, int(0.15 / frame_seconds))
+    voiced = np.convolve(voiced.astype(np.int8), np.ones(2 * hangover + 1, dtype=np.int8), mode='same') > 0
+    if not voiced.any():
+        return samples, stats
+
+    voiced_indices = np.flatnonzero(voiced)
+    first, last = voiced_indices[0], voiced_indices[-1]
+    keep = np.zeros(n_frames, dtype=bool)
+    keep[first:last + 1] = True
+
+    # Internal silent runs between first and last voiced frame
+    inner = ~voiced[first:last + 1]
+    edges = np.diff(np.concatenate(([0], inner.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1) + first
+    run_lengths = np.flatnonzero(edges == -1) + first - run_starts
+
+    max_pause_frames = int(round(max_pause / frame_seconds))
+    keep_pause_frames = int(round(keep_pause / frame_seconds))
+    long_runs = run_lengths > max_pause_frames
+    for start, length in zip(run_starts[long_runs], run_lengths[long_runs]):
+        # Keep the edges of the pause so speech doesn't run together
+        half = keep_pause_frames // 2
+        keep[start + half:start + length - (keep_pause_frames - half)] = False
+
+    sample_mask = np.repeat(keep, frame_length)
+    trimmed = samples[:n_frames * frame_length][sample_mask]
+
+    pauses = run_lengths[run_lengths * frame_seconds >= min_pause] * frame_seconds
+    stats.update({
+        'speech_duration': round(float(voiced[first:last + 1].sum() * frame_seconds), 2),
+        'trimmed_duration': round(len(trimmed) / sample_rate, 2),
+        'leading_silence': round(float(first * frame_seconds), 2),
+        'trailing_silence': round(float(duration - (last + 1) * frame_seconds), 2),
+        'pause_count': int(len(pauses)),
+        'longest_pause': round(float(pauses.max()), 2) if len(pauses) else 0.0,
+        'total_pause': round(float(pauses.sum()), 2),
+        'removed_pause': round(float(((last + 1 - first) - keep[first:last + 1].sum()) * frame_seconds), 2),
+    })
+    return trimmed, stats
@@ -0,0 +1,79 @@
+"""
+Circuit breaker for external services (Ollama).
+
+- closed: calls go through; `failure_threshold` consecutive failures open the circuit.
+- open: calls are refused immediately so callers take their fallback path with no added
+  latency. After `reset_timeout` seconds one background probe is started.
+- half-open: the probe is running; calls are still refused. A successful probe closes
+  the circuit, a failed one re-opens it for another `reset_timeout`.
+
+Requests never wait on the probe, and only one probe runs at a time.
+"""
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    def __init__(self, name, probe, failure_threshold=3, reset_timeout=30.0):
+        self.name = name
+        self.probe = probe  # Callable raising on failure
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """True if a call may be attempted now; never blocks"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                threading.Thread(target=self._run_probe, name=f'{self.name}-probe', daemon=True).start()
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"{self.name} circuit closed")
+            self.state = CLOSED
+            self.failures = 0
+            self.last_error = None
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error) if error else None
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    print(f"{self.name} circuit opened after {self.failures} failures: {error}")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def _run_probe(self):
+        try:
+            self.probe()
+        except Exception as e:
+            self.record_failure(e)
+        else:
+            self.record_success()
+
+    def snapshot(self):
+        """State for the health endpoint"""
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)), 1)
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'retry_in': retry_in,
+                'last_error': self.last_error,
+            }
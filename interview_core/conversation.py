@@ -0,0 +1,179 @@
+"""
+Rolling per-session conversation state.
+
+The interviewer prompt only needs the turn count and the last few turns, so instead of
+re-reading every Response on each answer the pipeline keeps a small state per session
+in Django's cache (CONVERSATION_CACHE_ALIAS) and updates it after each turn:
+
+    {'turns': answered turns, 'window': last HISTORY_WINDOW turns, 'last_response_id': id}
+
+On a cache miss the state is rebuilt from the database with one bounded query, so the
+per-turn DB work stays constant however long the session runs. With several server or
+worker processes, point the alias at a cache they share.
+
+With CONVERSATION_SUMMARY on, a background job also folds every answered turn into a
+rolling summary stored on the session. The prompt then carries that summary plus only
+the turns it doesn't cover yet, so earlier answers are remembered while the prompt
+stays within a fixed budget however long the interview runs.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Window
+
+from . import jobs
+from .ai_service import ai_service
+from .models import BackgroundJob, InterviewSession, Response
+
+# Turns kept for the prompt (generate_response uses the last four)
+HISTORY_WINDOW = 4
+
+
+def history_entry(resp, question):
+    return {
+        "question": question.text,
+        "answer": resp.transcription,
+        "score": resp.score,
+        "feedback": resp.ai_feedback
+    }
+
+
+def next_question_number(state):
+    """Number of the question the interviewer is about to ask: the current answer is turn `turns + 1`"""
+    return state['turns'] + 2
+
+
+def _cache():
+    return caches[getattr(settings, 'CONVERSATION_CACHE_ALIAS', 'default')]
+
+
+def _cache_key(session_id):
+    return f"interview:conversation:{session_id}"
+
+
+def _usable(state, response_id):
+    # A state that already covers this answer (e.g. a retried job) must be rebuilt
+    return state is not None and (state['last_response_id'] is None or state['last_response_id'] < response_id)
+
+
+def _previous_responses(session_id, response_id):
+    """
+    The last HISTORY_WINDOW responses before `response_id`, newest first, each annotated with
+    their total count. Later answers are left out, so rebuilding the state for an answer that
+    is reprocessed gives the same prompt it had the first time.
+    """
+    return (
+        Response.objects.filter(session_id=session_id, id__lt=response_id)
+        .select_related('question')
+        .annotate(turns=Window(Count('id')))
+        .order_by('-created_at', '-id')[:HISTORY_WINDOW]
+    )
+
+
+def _state_from_rows(rows):
+    if not rows:
+        return {'turns': 0, 'window': [], 'last_response_id': None}
+    return {
+        'turns': rows[0].turns,
+        'window': [history_entry(resp, resp.question) for resp in reversed(rows)],
+        'last_response_id': rows[0].id
+    }
+
+
+def _next_state(state, response_obj):
+    return {
+        'turns': state['turns'] + 1,
+        'window': (state['window'] + [history_entry(response_obj, response_obj.question)])[-HISTORY_WINDOW:],
+        'last_response_id': response_obj.id
+    }
+
+
+def load_state(session_id, response_id):
+    """Conversation state before the answer `response_id`"""
+    state = _cache().get(_cache_key(session_id))
+    if _usable(state, response_id):
+        return state
+    return _state_from_rows(list(_previous_responses(session_id, response_id)))
+
+
+async def aload_state(session_id, response_id):
+    """Async variant of load_state"""
+    state = await _cache().aget(_cache_key(session_id))
+    if _usable(state, response_id):
+        return state
+    return _state_from_rows([resp async for resp in _previous_responses(session_id, response_id)])
+
+
+def record_turn(state, response_obj):
+    """Add an evaluated answer to the session's state"""
+    _cache().set(
+        _cache_key(response_obj.session_id),
+        _next_state(state, response_obj),
+        getattr(settings, 'CONVERSATION_CACHE_TIMEOUT', 6 * 60 * 60)
+    )
+
+
+async def arecord_turn(state, response_obj):
+    """Async variant of record_turn"""
+    await _cache().aset(
+        _cache_key(response_obj.session_id),
+        _next_state(state, response_obj),
+        getattr(settings, 'CONVERSATION_CACHE_TIMEOUT', 6 * 60 * 60)
+    )
+
+
+def prompt_context(state, response_obj):
+    """
+    (history, summary) for the interviewer prompt: with a rolling summary, only the turns it
+    doesn't cover yet (at least the previous one) are sent in full; the current answer is last.
+    """
+    session = response_obj.session
+    window = state['window']
+    summary = session.summary if getattr(settings, 'CONVERSATION_SUMMARY', True) else ''
+    if session.summary_turns > state['turns']:
+        summary = ''  # Reprocessing an earlier answer: the summary already covers later turns
+    if summary:
+        first_turn = state['turns'] - len(window) + 1
+        uncovered = [entry for number, entry in enumerate(window, first_turn) if number > session.summary_turns]
+        window = uncovered or window[-1:]
+    return window + [history_entry(response_obj, response_obj.question)], summary or None
+
+
+def request_summary(session_id):
+    """Queue a summary update unless one is already waiting (it will pick up every new turn)"""
+    if not getattr(settings, 'CONVERSATION_SUMMARY', True):
+        return None
+    job = BackgroundJob.objects.filter(
+        kind='summarise_session',
+        payload__session_id=session_id,
+        status='pending'
+    ).first()
+    return job or jobs.enqueue('summarise_session', session_id=session_id)
+
+
+def run_summarise_session_job(job):
+    """Job handler: fold the session's newly answered turns into its rolling summary"""
+    session = InterviewSession.objects.get(id=job.payload['session_id'])
+    answered = (
+        Response.objects.filter(session=session, ai_feedback__isnull=False)
+        .select_related('question')
+        .order_by('created_at', 'id')
+    )
+    summary, folded = session.summary, session.summary_turns
+    while True:
+        # A few turns per call keeps each summary prompt bounded even after a backlog
+        batch = list(answered[folded:folded + HISTORY_WINDOW])
+        if not batch:
+            return {'summary_turns': folded}
+        turns = [
+            {'number': folded + i, 'question': resp.question.text, 'answer': resp.transcription, 'score': resp.score}
+            for i, resp in enumerate(batch, 1)
+        ]
+        summary = ai_service.summarise_conversation(summary, turns, session.topic)
+        updated = InterviewSession.objects.filter(id=session.id, summary_turns=folded).update(
+            summary=summary,
+            summary_turns=folded + len(batch)
+        )
+        if not updated:
+            # Another worker moved the summary on; its result stands
+            return {'summary_turns': None}
+        folded += len(batch)
@@ -0,0 +1,92 @@
+"""
+Local, DB-backed job queue.
+
+Web requests enqueue work with `enqueue()` and return immediately; worker processes
+started with `python manage.py process_jobs` claim pending jobs and run the handler
+registered for the job's kind. Any number of workers can drain the same queue, which
+lets the web tier scale separately from inference.
+"""
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import BackgroundJob
+
+# Job kind -> dotted path of a handler taking the BackgroundJob and returning a JSON-serialisable result
+JOB_HANDLERS = {
+    'process_response': 'interview_core.pipeline.run_process_response_job',
+    'render_report_pdf': 'interview_core.reports.run_render_report_pdf_job',
+    'summarise_session': 'interview_core.conversation.run_summarise_session_job',
+}
+
+
+def enqueue(kind, **payload):
+    """Add a job to the queue and return it"""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    return BackgroundJob.objects.create(kind=kind, payload=payload)
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_next(worker_id, kinds=None):
+    """
+    Atomically claim the oldest pending job.
+
+    The conditional UPDATE only succeeds for one worker, so concurrent workers never
+    run the same job, on SQLite as well as on server databases.
+    """
+    pending = BackgroundJob.objects.filter(status='pending')
+    if kinds:
+        pending = pending.filter(kind__in=kinds)
+
+    while True:
+        candidate = pending.order_by('created_at', 'id').values_list('id', flat=True).first()
+        if candidate is None:
+            return None
+        claimed = BackgroundJob.objects.filter(id=candidate, status='pending').update(
+            status='running',
+            worker=worker_id,
+            started_at=timezone.now(),
+            attempts=F('attempts') + 1
+        )
+        if claimed:
+            return BackgroundJob.objects.get(id=candidate)
+        # Another worker won the race; try the next one
+
+
+def run_job(job):
+    """Run a claimed job and record its outcome"""
+    try:
+        handler = import_string(JOB_HANDLERS[job.kind])
+        job.result = handler(job)
+        job.status = 'done'
+        job.error = None
+    except Exception as e:
+        print(f"Job {job.id} ({job.kind}) failed: {e}")
+        job.error = traceback.format_exc()
+        max_attempts = getattr(settings, 'JOB_MAX_ATTEMPTS', 3)
+        job.status = 'pending' if job.attempts < max_attempts else 'failed'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['result', 'status', 'error', 'finished_at'])
+    return job
+
+
+def requeue_stale():
+    """Return jobs whose worker died mid-run to the queue, or fail them once out of attempts"""
+    lease = timedelta(seconds=getattr(settings, 'JOB_LEASE_SECONDS', 300))
+    max_attempts = getattr(settings, 'JOB_MAX_ATTEMPTS', 3)
+    stale = BackgroundJob.objects.filter(status='running', started_at__lt=timezone.now() - lease)
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        status='failed', error='Worker lease expired', finished_at=timezone.now()
+    )
+    requeued = stale.update(status='pending')
+    return requeued, failed
@@ -0,0 +1,350 @@
+"""
+Shared Ollama client with timeouts and admission control.
+
+- One ollama.Client (and one AsyncClient per event loop) is reused for every call, so
+  HTTP connections to Ollama stay open between requests.
+- Calls have explicit connect/read timeouts (OLLAMA_CONNECT_TIMEOUT / OLLAMA_READ_TIMEOUT).
+  The read timeout is raised to the longest task deadline so a deadline always fires
+  first, and a read timeout that does fire is reported as DeadlineExceeded: Ollama is
+  slow, not down, and the circuit breaker shouldn't count it as an outage.
+- Chats pass keep_alive=OLLAMA_KEEP_ALIVE so the model, and with it the cached prompt
+  prefix, stays loaded between turns.
+- Callers name a task ('interviewer', 'report', ...) instead of a model; OLLAMA_MODELS maps
+  each task to a model and a deadline in seconds. The deadline covers queueing and
+  generation: when it passes the request to Ollama is cancelled and DeadlineExceeded is
+  raised, so the caller's fallback answers within a bounded time. Sync calls with a
+  deadline run on a private event loop so they can be cancelled the same way.
+- At most OLLAMA_MAX_CONCURRENCY generations are in flight. Further callers, sync or
+  async, wait in one FIFO queue; after OLLAMA_QUEUE_TIMEOUT seconds they get
+  AdmissionTimeout and take the fallback path instead of piling onto Ollama.
+
+Queue depth and wait times are reported by `stats()` (see /api/health/).
+"""
+import asyncio
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+import httpx
+import ollama
+from django.conf import settings
+
+
+DEFAULT_MODEL = 'llama3'
+
+
+class AdmissionTimeout(Exception):
+    """Waited longer than OLLAMA_QUEUE_TIMEOUT for a generation slot"""
+
+
+class DeadlineExceeded(Exception):
+    """The task's deadline passed before Ollama finished"""
+
+
+def call_stats(response):
+    """Token counts and timings (ms) Ollama reports for a finished chat, or the final stream chunk"""
+    return {
+        'model': response.get('model'),
+        'prompt_tokens': response.get('prompt_eval_count') or 0,
+        'eval_tokens': response.get('eval_count') or 0,
+        'prompt_eval_ms': round((response.get('prompt_eval_duration') or 0) / 1e6, 1),
+        'eval_ms': round((response.get('eval_duration') or 0) / 1e6, 1),
+        'load_ms': round((response.get('load_duration') or 0) / 1e6, 1),
+        'total_ms': round((response.get('total_duration') or 0) / 1e6, 1),
+    }
+
+
+def task_model(task):
+    """(model, deadline in seconds or None) for a task in OLLAMA_MODELS"""
+    entry = getattr(settings, 'OLLAMA_MODELS', {}).get(task, {})
+    return entry.get('model', DEFAULT_MODEL), entry.get('deadline')
+
+
+def read_timeout():
+    """OLLAMA_READ_TIMEOUT, raised to the longest task deadline"""
+    deadlines = [entry.get('deadline') or 0 for entry in getattr(settings, 'OLLAMA_MODELS', {}).values()]
+    return max([getattr(settings, 'OLLAMA_READ_TIMEOUT', 120.0)] + deadlines)
+
+
+@contextmanager
+def _slow_reads_as_deadline(model):
+    """Report read/write/pool timeouts as DeadlineExceeded; connection failures pass through"""
+    try:
+        yield
+    except (httpx.ReadTimeout, httpx.WriteTimeout, httpx.PoolTimeout) as e:
+        raise DeadlineExceeded(f"{model} timed out waiting for Ollama: {e!r}") from e
+
+
+class _ThreadWaiter:
+    def __init__(self):
+        self.granted = False
+        self._event = threading.Event()
+
+    def wake(self):
+        self._event.set()
+
+    def wait(self, timeout):
+        return self._event.wait(timeout)
+
+
+class _AsyncWaiter:
+    def __init__(self, loop):
+        self.granted = False
+        self.loop = loop
+        self.future = loop.create_future()
+
+    def wake(self):
+        self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class FairLimiter:
+    """
+    Counting semaphore shared by threads and event loops, granting slots in arrival order.
+    A released slot is handed directly to the oldest waiter, so late arrivals can't overtake.
+    """
+
+    def __init__(self, limit, queue_timeout):
+        self.limit = max(1, limit)
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    def _admit_or_enqueue(self, waiter):
+        with self._lock:
+            if self.in_flight < self.limit and not self._waiters:
+                self.in_flight += 1
+                return True
+            self._waiters.append(waiter)
+            return False
+
+    def _abandon(self, waiter, timed_out):
+        """Leave the queue; returns False if the slot was granted in the meantime"""
+        with self._lock:
+            if waiter.granted:
+                return False
+            self._waiters.remove(waiter)
+            if timed_out:
+                self.rejected += 1
+            return True
+
+    def _record_wait(self, started):
+        waited = time.monotonic() - started
+        with self._lock:
+            self.admitted += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def acquire(self):
+        started = time.monotonic()
+        waiter = _ThreadWaiter()
+        if not self._admit_or_enqueue(waiter):
+            if not waiter.wait(self.queue_timeout) and self._abandon(waiter, timed_out=True):
+                raise AdmissionTimeout(f"No Ollama slot within {self.queue_timeout}s")
+        self._record_wait(started)
+
+    async def aacquire(self):
+        started = time.monotonic()
+        waiter = _AsyncWaiter(asyncio.get_running_loop())
+        if not self._admit_or_enqueue(waiter):
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout)
+            except asyncio.TimeoutError:
+                if self._abandon(waiter, timed_out=True):
+                    raise AdmissionTimeout(f"No Ollama slot within {self.queue_timeout}s")
+            except asyncio.CancelledError:
+                # Client went away: give up our place, or the slot if we already got one
+                if not self._abandon(waiter, timed_out=False):
+                    self.release()
+                raise
+        self._record_wait(started)
+
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                waiter.wake()
+            else:
+                self.in_flight -= 1
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def aslot(self):
+        await self.aacquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'in_flight': self.in_flight,
+                'queued': len(self._waiters),
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'avg_wait_ms': round(1000 * self.total_wait / self.admitted, 1) if self.admitted else 0.0,
+                'max_wait_ms': round(1000 * self.max_wait, 1),
+            }
+
+
+class LLMClient:
+    def __init__(self):
+        self._client = None
+        self._async_clients = weakref.WeakKeyDictionary()  # loop -> (AsyncClient, closer); httpx async clients are bound to their loop
+        self._limiter = None
+        self._bridge_loop = None
+        self._lock = threading.Lock()
+
+    def _client_options(self):
+        return {
+            'host': getattr(settings, 'OLLAMA_HOST', None),
+            'timeout': httpx.Timeout(read_timeout(), connect=getattr(settings, 'OLLAMA_CONNECT_TIMEOUT', 2.0)),
+            'limits': httpx.Limits(max_keepalive_connections=self.limiter.limit + 2, keepalive_expiry=60),
+        }
+
+    @property
+    def limiter(self):
+        with self._lock:
+            if self._limiter is None:
+                self._limiter = FairLimiter(
+                    getattr(settings, 'OLLAMA_MAX_CONCURRENCY', 2),
+                    getattr(settings, 'OLLAMA_QUEUE_TIMEOUT', 30.0)
+                )
+            return self._limiter
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = ollama.Client(**self._client_options())
+        return self._client
+
+    def async_client(self):
+        """
+        The AsyncClient for the running loop. It is closed when the loop shuts down its async
+        generators (asyncio.run, asgiref's async_to_sync and ASGI servers all do), so loops
+        created per call don't each leave an open connection pool behind.
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.get(loop)
+        if entry is None:
+            client = ollama.AsyncClient(**self._client_options())
+            closer = self._close_with_loop(loop, client)
+            loop.create_task(anext(closer))  # First step registers it with the loop's shutdown
+            entry = self._async_clients[loop] = (client, closer)
+        return entry[0]
+
+    async def _close_with_loop(self, loop, client):
+        """Async generator parked after its first step; the loop's shutdown_asyncgens() closes `client`"""
+        try:
+            yield
+        finally:
+            self._async_clients.pop(loop, None)
+            await client.__aexit__(None, None, None)
+
+    def list(self):
+        """Cheap liveness call; not subject to admission control"""
+        return self.client.list()
+
+    def _with_defaults(self, kwargs):
+        """Fill in model and keep_alive; returns the deadline for the call"""
+        model, deadline = task_model(kwargs.pop('task', None))
+        kwargs.setdefault('model', model)
+        kwargs.setdefault('keep_alive', getattr(settings, 'OLLAMA_KEEP_ALIVE', '30m'))
+        return kwargs.pop('deadline', deadline)
+
+    def _bridge(self):
+        """Event loop thread that runs sync calls with a deadline"""
+        with self._lock:
+            if self._bridge_loop is None:
+                self._bridge_loop = asyncio.new_event_loop()
+                threading.Thread(target=self._bridge_loop.run_forever, name='ollama-bridge', daemon=True).start()
+            return self._bridge_loop
+
+    def chat(self, **kwargs):
+        """
+        Client.chat with admission control. Accepts task= (model and deadline from
+        OLLAMA_MODELS) and deadline= (seconds, overrides the task's).
+        """
+        deadline = self._with_defaults(kwargs)
+        if deadline is not None and not kwargs.get('stream'):
+            future = asyncio.run_coroutine_threadsafe(self.achat(deadline=deadline, **kwargs), self._bridge())
+            return future.result()
+        with self.limiter.slot(), _slow_reads_as_deadline(kwargs['model']):
+            return self.client.chat(**kwargs)
+
+    async def achat(self, **kwargs):
+        """Async chat; with stream=True the slot is held (and the deadline applies) until the stream ends"""
+        deadline = self._with_defaults(kwargs)
+        if deadline is None:
+            return await self._achat(**kwargs)
+
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + deadline
+        try:
+            response = await asyncio.wait_for(self._achat(**kwargs), deadline)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"{kwargs['model']} missed its {deadline}s deadline")
+        if kwargs.get('stream'):
+            return self._deadline_stream(response, expires, kwargs['model'], deadline)
+        return response
+
+    async def _achat(self, **kwargs):
+        await self.limiter.aacquire()
+        try:
+            with _slow_reads_as_deadline(kwargs['model']):
+                response = await self.async_client().chat(**kwargs)
+        except BaseException:
+            self.limiter.release()
+            raise
+        if kwargs.get('stream'):
+            return self._held_stream(response, kwargs['model'])
+        self.limiter.release()
+        return response
+
+    async def _held_stream(self, stream, model):
+        try:
+            with _slow_reads_as_deadline(model):
+                async for chunk in stream:
+                    yield chunk
+        finally:
+            self.limiter.release()
+
+    async def _deadline_stream(self, stream, expires, model, deadline):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(anext(stream), max(0.0, expires - loop.time()))
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    raise DeadlineExceeded(f"{model} missed its {deadline}s deadline")
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    def stats(self):
+        return self.limiter.stats()
+
+
+llm_client = LLMClient()
@@ -0,0 +1,68 @@
+import json
+import re
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from interview_core.transcription import TRANSCRIPTION_BACKENDS, load_audio, load_backend
+
+SAMPLE_RATE = 16000
+
+
+def normalize_words(text):
+    return re.sub(r"[^a-z0-9' ]+", " ", text.lower()).split()
+
+
+def word_errors(reference, hypothesis):
+    """Word-level edit distance (substitutions + deletions + insertions)"""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i] + [0] * len(hypothesis)
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    return previous[-1]
+
+
+class Command(BaseCommand):
+    help = "Compare transcription backends on real-time factor and word error rate over a fixed set of recorded answers"
+
+    def add_arguments(self, parser):
+        parser.add_argument('manifest', help='JSON list of {"audio": path, "reference": transcript}')
+        parser.add_argument('--backends', nargs='+', default=list(TRANSCRIPTION_BACKENDS), choices=list(TRANSCRIPTION_BACKENDS))
+        parser.add_argument('--model', default=getattr(settings, 'TRANSCRIPTION_MODEL', 'base'))
+
+    def handle(self, *args, **options):
+        with open(options['manifest']) as f:
+            manifest = json.load(f)
+        if not manifest:
+            raise CommandError("Manifest is empty")
+
+        # Decode once up front so only model time is measured
+        samples = [load_audio(item['audio']) for item in manifest]
+        references = [normalize_words(item['reference']) for item in manifest]
+        audio_seconds = sum(len(audio) for audio in samples) / SAMPLE_RATE
+
+        self.stdout.write(f"{len(manifest)} answers, {audio_seconds:.1f}s of audio")
+        self.stdout.write(f"{'backend':<16} {'load s':>7} {'decode s':>9} {'RTF':>6} {'WER':>7}")
+        for name in options['backends']:
+            started = time.perf_counter()
+            backend = load_backend(name, options['model'])
+            load_time = time.perf_counter() - started
+
+            backend.transcribe(samples[0])  # warm-up
+
+            errors = 0
+            started = time.perf_counter()
+            for audio, reference in zip(samples, references):
+                errors += word_errors(reference, normalize_words(backend.transcribe(audio)))
+            decode_time = time.perf_counter() - started
+
+            rtf = decode_time / audio_seconds if audio_seconds else 0.0
+            wer = errors / max(sum(len(reference) for reference in references), 1)
+            self.stdout.write(f"{name:<16} {load_time:>7.1f} {decode_time:>9.1f} {rtf:>6.3f} {wer:>7.1%}")
@@ -0,0 +1,75 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+
+ENDPOINTS = {
+    'sync': '/api/process-response/',
+    'async': '/api/async/process-response/',
+}
+
+
+class Command(BaseCommand):
+    help = "Measure per-request latency and concurrency of the sync and async process-response endpoints against a running server"
+
+    def add_arguments(self, parser):
+        parser.add_argument('audio', help="Recorded answer to upload (webm/ogg/wav)")
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--endpoint', choices=['sync', 'async', 'both'], default='both')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+        parser.add_argument('--requests', type=int, default=8, help="Requests per concurrency level")
+        parser.add_argument('--topic', default='Python Developer')
+
+    def handle(self, *args, **options):
+        with open(options['audio'], 'rb') as f:
+            audio = f.read()
+
+        base_url = options['base_url'].rstrip('/')
+        endpoints = ['sync', 'async'] if options['endpoint'] == 'both' else [options['endpoint']]
+
+        self.stdout.write(f"{'endpoint':<8} {'conc':>5} {'ok':>4} {'p50 s':>8} {'p95 s':>8} {'max s':>8} {'req/s':>7}")
+        for name in endpoints:
+            for concurrency in options['concurrency']:
+                stats = self._run_level(base_url, ENDPOINTS[name], audio, options['topic'], concurrency, options['requests'])
+                self.stdout.write(
+                    f"{name:<8} {concurrency:>5} {stats['ok']:>4} {stats['p50']:>8.2f} {stats['p95']:>8.2f} "
+                    f"{stats['max']:>8.2f} {stats['throughput']:>7.2f}"
+                )
+
+    def _start_session(self, base_url, topic):
+        resp = requests.post(f"{base_url}/api/start-session/", json={'topic': topic}, timeout=120)
+        if resp.status_code != 201:
+            raise CommandError(f"Could not start session: {resp.status_code} {resp.text}")
+        data = resp.json()
+        return data['session_id'], data['question_id']
+
+    def _submit(self, base_url, path, audio, topic):
+        # One session per request so concurrent candidates don't share interview state
+        session_id, question_id = self._start_session(base_url, topic)
+        started = time.perf_counter()
+        resp = requests.post(
+            f"{base_url}{path}",
+            data={'session_id': session_id, 'question_id': question_id},
+            files={'audio_file': ('answer.webm', audio)},
+            timeout=600
+        )
+        return resp.status_code == 200, time.perf_counter() - started
+
+    def _run_level(self, base_url, path, audio, topic, concurrency, total):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda _: self._submit(base_url, path, audio, topic), range(total)))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for _, latency in results)
+        p95_index = max(0, int(round(0.95 * len(latencies))) - 1)
+        return {
+            'ok': sum(1 for ok, _ in results if ok),
+            'p50': statistics.median(latencies),
+            'p95': latencies[p95_index],
+            'max': latencies[-1],
+            'throughput': total / elapsed if elapsed else 0.0,
+        }
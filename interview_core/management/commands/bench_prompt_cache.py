@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interview_core.ai_service import ai_service, INTERVIEWER_SYSTEM_PROMPT
+from interview_core.llm_client import llm_client, task_model
+
+ANSWERS = [
+    "I am a final year computer science student and I have built a few web projects with my friends.",
+    "I like solving problems and I enjoy learning new frameworks in my free time.",
+    "A list is mutable and a tuple is immutable, so tuples can be used as dictionary keys.",
+    "In my college project we used Django and PostgreSQL to build an attendance system.",
+    "When two teammates disagreed I suggested we try both approaches on a small prototype.",
+    "I would first reproduce the bug, then add logging around the failing function.",
+]
+
+
+def legacy_layout(messages):
+    """The previous layout: per-turn role, category and guidelines at the top of the system prompt"""
+    turn = messages[-1]['content']
+    context, _, answer = turn.partition('CURRENT QUESTION:')
+    return (
+        [{'role': 'system', 'content': context.strip() + '\n\n' + INTERVIEWER_SYSTEM_PROMPT}]
+        + messages[1:-1]
+        + [{'role': 'user', 'content': 'CURRENT QUESTION:' + answer}]
+    )
+
+
+class Command(BaseCommand):
+    help = "Compare Ollama prompt-eval tokens and time per interviewer turn for the old and cache-friendly prompt layouts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--topics', nargs='+', default=['Python Developer', 'Data Analyst'])
+        parser.add_argument('--turns', type=int, default=len(ANSWERS))
+        parser.add_argument('--model', default=None, help="Default: the interviewer model in OLLAMA_MODELS")
+
+    def handle(self, *args, **options):
+        try:
+            llm_client.list()
+        except Exception as e:
+            raise CommandError(f"Ollama is not reachable: {e}")
+        model = options['model'] or task_model('interviewer')[0]
+
+        results = {}
+        for layout in ('legacy', 'cached'):
+            rows = []
+            for topic in options['topics']:
+                history = []
+                for turn in range(options['turns']):
+                    answer = ANSWERS[turn % len(ANSWERS)]
+                    messages, question_number = ai_service._build_interviewer_messages(answer, history, topic)
+                    if layout == 'legacy':
+                        messages = legacy_layout(messages)
+                    started = time.perf_counter()
+                    # Only prompt evaluation is of interest: generate a single token
+                    response = llm_client.chat(model=model, messages=messages, options={'num_predict': 1})
+                    wall = time.perf_counter() - started
+                    rows.append((
+                        response.get('prompt_eval_count') or 0,
+                        (response.get('prompt_eval_duration') or 0) / 1e6,
+                        wall * 1000
+                    ))
+                    self.stdout.write(
+                        f"{layout:<7} {topic[:20]:<20} turn {question_number:>2}: "
+                        f"{rows[-1][0]:>5} tokens evaluated, {rows[-1][1]:>8.1f} ms prompt eval, {rows[-1][2]:>8.1f} ms wall"
+                    )
+                    history.append({'question': f"Question {question_number}", 'answer': answer, 'score': 6,
+                                    'feedback': "Good start, add a concrete example next time."})
+            results[layout] = rows
+
+        self.stdout.write(f"{'layout':<7} {'avg tokens':>10} {'avg eval ms':>11} {'avg wall ms':>11}")
+        for layout, rows in results.items():
+            count = max(len(rows), 1)
+            self.stdout.write(
+                f"{layout:<7} {sum(r[0] for r in rows) / count:>10.0f} "
+                f"{sum(r[1] for r in rows) / count:>11.1f} {sum(r[2] for r in rows) / count:>11.1f}"
+            )
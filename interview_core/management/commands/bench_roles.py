@@ -0,0 +1,67 @@
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interview_core import roles
+from interview_core.role_examples import ROLE_TABLE
+
+
+def legacy_category(topic):
+    """The substring chain classify() replaced, kept for timing comparison"""
+    topic_lower = topic.lower()
+    chains = [
+        ("Software Development", ['python', 'java', 'c++', 'javascript', 'developer', 'programmer', 'software engineer']),
+        ("Data Science & Analytics", ['data scientist', 'data analyst', 'machine learning', 'ai', 'ml']),
+        ("Web Development", ['web', 'frontend', 'backend', 'fullstack', 'react', 'angular', 'node']),
+        ("DevOps & Cloud", ['devops', 'cloud', 'aws', 'azure', 'kubernetes', 'docker']),
+        ("Quality Assurance", ['qa', 'test', 'quality assurance', 'automation']),
+        ("Mobile Development", ['mobile', 'android', 'ios', 'flutter', 'react native']),
+        ("Database Administration", ['database', 'sql', 'dba', 'mongodb', 'postgresql']),
+        ("Cybersecurity", ['security', 'cybersecurity', 'penetration', 'ethical hacking']),
+        ("UI/UX Design", ['ui', 'ux', 'design', 'graphic']),
+        ("Project Management", ['project manager', 'scrum', 'agile', 'product manager']),
+        ("Business Analysis", ['business analyst', 'ba', 'requirements']),
+        ("Network Engineering", ['network', 'cisco', 'routing', 'switching']),
+    ]
+    for category, keywords in chains:
+        if any(kw in topic_lower for kw in keywords):
+            return category
+    return roles.GENERAL_CATEGORY
+
+
+class Command(BaseCommand):
+    help = "Check the role classifier against a table of topics and time it against the old substring chain"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=20000, help="Classifications per timing run")
+
+    def handle(self, *args, **options):
+        failures = 0
+        self.stdout.write(f"{'topic':<30} {'category':<26} {'tech':<11} {'old category':<26}")
+        for topic, category, tech in ROLE_TABLE:
+            role = roles.classify(topic)
+            ok = role == (category, tech)
+            failures += not ok
+            self.stdout.write(
+                f"{topic[:30]:<30} {role.category:<26} {str(role.tech):<11} {legacy_category(topic):<26}"
+                + ("" if ok else f"  EXPECTED {category} / {tech}")
+            )
+
+        topics = [topic for topic, _, _ in ROLE_TABLE]
+        number = options['number']
+
+        def per_call_us(func):
+            elapsed = min(timeit.repeat(lambda: [func(topic) for topic in topics], number=max(1, number // len(topics)), repeat=3))
+            return elapsed / (max(1, number // len(topics)) * len(topics)) * 1e6
+
+        def uncached(topic):
+            roles._classify.__wrapped__(roles.normalise_topic(topic))
+
+        self.stdout.write("")
+        self.stdout.write(f"old substring chain:     {per_call_us(legacy_category):6.2f} us/topic (category only)")
+        self.stdout.write(f"classify, uncached:      {per_call_us(uncached):6.2f} us/topic")
+        self.stdout.write(f"classify, memoized:      {per_call_us(roles.classify):6.2f} us/topic")
+
+        if failures:
+            raise CommandError(f"{failures} of {len(ROLE_TABLE)} topics misclassified")
+        self.stdout.write(f"All {len(ROLE_TABLE)} topics classified as expected")
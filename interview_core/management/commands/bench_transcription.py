@@ -0,0 +1,65 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from interview_core.ai_service import ai_service
+from interview_core.transcription import TranscriptionBatcher, ProcessPoolTranscriber, load_audio
+
+
+class Command(BaseCommand):
+    help = "Measure transcription throughput (answers/second) per executor mode at several concurrency levels"
+
+    def add_arguments(self, parser):
+        parser.add_argument('audio', nargs='+', help="Recorded answers to cycle through")
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+        parser.add_argument('--rounds', type=int, default=2, help="Answers per candidate at each level")
+        parser.add_argument('--window-ms', type=int, default=getattr(settings, 'WHISPER_BATCH_WINDOW_MS', 50))
+        parser.add_argument('--max-batch-size', type=int, default=getattr(settings, 'WHISPER_BATCH_MAX_SIZE', 8))
+        parser.add_argument('--workers', type=int, nargs='*', default=[], help="Also measure process pools of these sizes")
+        parser.add_argument('--torch-threads', type=int, default=getattr(settings, 'WHISPER_TORCH_THREADS', 1))
+
+    def handle(self, *args, **options):
+        backend = ai_service.transcription_backend
+        if backend is None:
+            raise CommandError("Transcription model could not be loaded")
+
+        # Current behaviour: one transcribe() per request on the shared model, serialised
+        # because the model is not safe to call from several threads at once
+        model_lock = threading.Lock()
+
+        def per_request(path):
+            with model_lock:
+                return backend.transcribe(load_audio(path))
+
+        batcher = TranscriptionBatcher(backend, window_ms=options['window_ms'], max_batch_size=options['max_batch_size'])
+        modes = {'per-request': per_request, 'batched': batcher.transcribe}
+        for workers in options['workers']:
+            pool = ProcessPoolTranscriber(
+                backend.name,
+                backend.model_name,
+                compute_type=backend.compute_type,
+                workers=workers,
+                torch_threads=options['torch_threads']
+            )
+            # Start every worker (and load its model) before measuring
+            for future in [pool.submit(options['audio'][0]) for _ in range(workers)]:
+                future.result()
+            modes[f'process x{workers}'] = pool.transcribe
+
+        # Warm up every path so model initialisation isn't measured
+        for transcribe in modes.values():
+            transcribe(options['audio'][0])
+
+        self.stdout.write(f"{'mode':<14} {'candidates':>10} {'answers':>8} {'seconds':>8} {'answers/s':>10}")
+        for concurrency in options['concurrency']:
+            for name, transcribe in modes.items():
+                total = concurrency * options['rounds']
+                jobs = [options['audio'][i % len(options['audio'])] for i in range(total)]
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=concurrency) as candidates:
+                    list(candidates.map(transcribe, jobs))
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f"{name:<14} {concurrency:>10} {total:>8} {elapsed:>8.2f} {total / elapsed:>10.2f}")
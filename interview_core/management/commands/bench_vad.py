@@ -0,0 +1,67 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from interview_core.ai_service import ai_service
+from interview_core.audio import trim_silence
+from interview_core.transcription import load_audio
+
+
+class Command(BaseCommand):
+    help = "Measure audio and transcription time saved by silence trimming on recorded answers"
+
+    def add_arguments(self, parser):
+        parser.add_argument('audio', nargs='+', help="Recorded answers")
+        parser.add_argument('--repeat', type=int, default=3, help="Transcriptions per answer and variant (best time is kept)")
+        parser.add_argument('--max-pause', type=float, default=getattr(settings, 'VAD_MAX_PAUSE_SECONDS', 1.0))
+        parser.add_argument('--keep-pause', type=float, default=getattr(settings, 'VAD_KEEP_PAUSE_SECONDS', 0.3))
+        parser.add_argument('--no-transcribe', action='store_true', help="Only report the audio removed")
+
+    def handle(self, *args, **options):
+        backend = None
+        if not options['no_transcribe']:
+            backend = ai_service.transcription_backend
+            if backend is None:
+                raise CommandError("Transcription model could not be loaded")
+
+        def best_time(samples):
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                backend.transcribe(samples)
+                timings.append(time.perf_counter() - started)
+            return min(timings)
+
+        self.stdout.write(
+            f"{'answer':<28} {'audio s':>8} {'trimmed s':>9} {'pauses':>6} {'trim ms':>8} "
+            f"{'asr s':>7} {'asr trimmed s':>13} {'saved':>6}"
+        )
+        totals = {'audio': 0.0, 'trimmed': 0.0, 'asr': 0.0, 'asr_trimmed': 0.0}
+        for path in options['audio']:
+            samples = load_audio(path)
+
+            started = time.perf_counter()
+            trimmed, stats = trim_silence(samples, max_pause=options['max_pause'], keep_pause=options['keep_pause'])
+            trim_ms = (time.perf_counter() - started) * 1000
+
+            totals['audio'] += stats['duration']
+            totals['trimmed'] += stats['trimmed_duration']
+            asr = asr_trimmed = 0.0
+            if backend is not None:
+                backend.transcribe(samples)  # Warm up
+                asr = best_time(samples)
+                asr_trimmed = best_time(trimmed)
+                totals['asr'] += asr
+                totals['asr_trimmed'] += asr_trimmed
+
+            saved = 1 - (asr_trimmed / asr if asr else stats['trimmed_duration'] / max(stats['duration'], 1e-9))
+            self.stdout.write(
+                f"{path[-28:]:<28} {stats['duration']:>8.2f} {stats['trimmed_duration']:>9.2f} "
+                f"{stats['pause_count']:>6} {trim_ms:>8.1f} {asr:>7.2f} {asr_trimmed:>13.2f} {saved:>6.0%}"
+            )
+
+        audio_saved = 1 - totals['trimmed'] / max(totals['audio'], 1e-9)
+        self.stdout.write(f"Audio removed: {audio_saved:.0%} of {totals['audio']:.1f} s")
+        if backend is not None and totals['asr']:
+            self.stdout.write(f"Transcription time saved: {1 - totals['asr_trimmed'] / totals['asr']:.0%}")
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from interview_core.models import Response
+
+FIELDS = ['prompt_tokens', 'eval_tokens', 'prompt_eval_ms', 'eval_ms', 'total_ms']
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Command(BaseCommand):
+    help = "Summarise stored Ollama token counts and timings per interviewer prompt variant and model"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help="Only answers evaluated in the last N days")
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options['days'])
+        rows = Response.objects.filter(created_at__gte=since).values_list('llm_stats', 'score')
+
+        groups = {}
+        fallbacks = 0
+        for stats, score in rows.iterator():
+            if not stats:
+                fallbacks += 1
+                continue
+            key = (stats.get('prompt_variant', 'full'), stats.get('model') or '?')
+            groups.setdefault(key, []).append((stats, score))
+
+        if not groups:
+            self.stdout.write(f"No evaluated answers with stats in the last {options['days']} days")
+            return
+
+        self.stdout.write(
+            f"{'variant':<8} {'model':<16} {'calls':>6} {'prompt tok':>10} {'eval tok':>8} "
+            f"{'prompt ms':>9} {'eval ms':>8} {'total ms':>8} {'p95 ms':>8} {'score':>5}"
+        )
+        for (variant, model), items in sorted(groups.items()):
+            count = len(items)
+            means = {field: sum(stats.get(field) or 0 for stats, _ in items) / count for field in FIELDS}
+            p95 = percentile([stats.get('total_ms') or 0 for stats, _ in items], 0.95)
+            score = sum(score for _, score in items) / count
+            self.stdout.write(
+                f"{variant:<8} {model[:16]:<16} {count:>6} {means['prompt_tokens']:>10.0f} {means['eval_tokens']:>8.0f} "
+                f"{means['prompt_eval_ms']:>9.0f} {means['eval_ms']:>8.0f} {means['total_ms']:>8.0f} {p95:>8.0f} {score:>5.1f}"
+            )
+        self.stdout.write(f"{fallbacks} answers were scored by the fallback (no Ollama stats)")
@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from interview_core.ai_service import ai_service, TTS_VOICE
+from interview_core.models import InterviewSession
+
+
+class Command(BaseCommand):
+    help = (
+        "Synthesise and pin audio for every question known ahead of time (role openings and "
+        "fallback banks) so live sessions never wait on Edge-TTS for them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'topics', nargs='*',
+            help="Job roles exactly as candidates enter them (default: every topic seen in past sessions)"
+        )
+        parser.add_argument('--concurrency', type=int, default=getattr(settings, 'TTS_PIPELINE_CONCURRENCY', 4))
+        parser.add_argument('--dry-run', action='store_true', help="List the questions without synthesising them")
+
+    def handle(self, *args, **options):
+        topics = options['topics'] or list(
+            InterviewSession.objects.order_by().values_list('topic', flat=True).distinct()
+        )
+        if not topics:
+            raise CommandError("No topics given and no past sessions to take them from")
+
+        texts = list(dict.fromkeys(text for topic in topics for text in ai_service.static_questions(topic)))
+        self.stdout.write(f"{len(texts)} questions for {len(topics)} topics")
+        if options['dry_run']:
+            for text in texts:
+                self.stdout.write(f"  {text}")
+            return
+
+        cache = ai_service.tts_cache
+        hits_before = cache.hits
+        started = time.perf_counter()
+        results = asyncio.run(self._render_all(texts, max(1, options['concurrency'])))
+        elapsed = time.perf_counter() - started
+
+        rendered = [text for text, url in results if url]
+        failed = [text for text, url in results if not url]
+        pinned = cache.pin(cache.key(text, TTS_VOICE) for text in rendered)
+
+        for text in failed:
+            self.stderr.write(f"Failed: {text}")
+        self.stdout.write(
+            f"Rendered {len(rendered)}/{len(texts)} in {elapsed:.1f}s "
+            f"({cache.hits - hits_before} already cached), {pinned} entries pinned"
+        )
+        if failed:
+            raise CommandError(f"{len(failed)} questions could not be synthesised")
+
+    async def _render_all(self, texts, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def render(text):
+            async with semaphore:
+                return text, await ai_service.atext_to_speech(text)
+
+        return await asyncio.gather(*(render(text) for text in texts))
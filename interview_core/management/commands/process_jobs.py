@@ -0,0 +1,42 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from interview_core import jobs
+
+
+class Command(BaseCommand):
+    help = "Run a worker that drains the background job queue (start one per process you want to dedicate to inference)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kinds', nargs='+', help="Only run jobs of these kinds")
+        parser.add_argument('--burst', action='store_true', help="Exit once the queue is empty")
+        parser.add_argument('--poll-interval', type=float, default=getattr(settings, 'JOB_POLL_INTERVAL', 1.0))
+        parser.add_argument('--worker-id', default=jobs.default_worker_id())
+
+    def handle(self, *args, **options):
+        worker_id = options['worker_id']
+        poll_interval = options['poll_interval']
+        self.stdout.write(f"Job worker {worker_id} started")
+
+        last_sweep = 0.0
+        while True:
+            # Periodically recover jobs abandoned by crashed workers
+            if time.monotonic() - last_sweep > poll_interval * 30:
+                requeued, failed = jobs.requeue_stale()
+                if requeued or failed:
+                    self.stdout.write(f"Recovered stale jobs: {requeued} requeued, {failed} failed")
+                last_sweep = time.monotonic()
+
+            job = jobs.claim_next(worker_id, kinds=options['kinds'])
+            if job is None:
+                if options['burst']:
+                    self.stdout.write("Queue empty, exiting")
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            started = time.perf_counter()
+            job = jobs.run_job(job)
+            self.stdout.write(f"{job} in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_core', '0002_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='response',
+            name='audio_stats',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
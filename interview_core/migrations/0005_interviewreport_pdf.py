@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_core', '0004_interviewreport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewreport',
+            name='pdf',
+            field=models.FileField(blank=True, upload_to='reports/'),
+        ),
+        migrations.AddField(
+            model_name='interviewreport',
+            name='pdf_fingerprint',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:51
+
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_session_questions(apps, schema_editor):
+    """
+    Link existing questions to their sessions. Answered questions come from the session's
+    responses. A session's unanswered question (e.g. the last question of an abandoned
+    session) is the same-topic question nobody answered that was created after the
+    session's last response (or its start) and before the next response in any other
+    same-topic session, so overlapping sessions can't take each other's questions. If that
+    window holds more than one such question, or two sessions' windows pick the same one,
+    the owner is ambiguous and the question is left unlinked.
+
+    asked_at is set from the question's created_at (each question row was created when it
+    was asked) rather than the time of the migration.
+    """
+    InterviewSession = apps.get_model('interview_core', 'InterviewSession')
+    Question = apps.get_model('interview_core', 'Question')
+    Response = apps.get_model('interview_core', 'Response')
+    SessionQuestion = apps.get_model('interview_core', 'SessionQuestion')
+
+    answered_anywhere = set(Response.objects.values_list('question_id', flat=True))
+    sessions = []  # (session id, answered question ids in order, unanswered question id or None)
+    for session in InterviewSession.objects.order_by('start_time', 'id'):
+        responses = Response.objects.filter(session=session)
+        answered = set(responses.values_list('question_id', flat=True))
+        last_response = responses.order_by('-created_at').values_list('created_at', flat=True).first()
+        since = last_response or session.start_time
+
+        window = Question.objects.filter(topic=session.topic, created_at__gte=since).exclude(id__in=answered_anywhere)
+        next_other_response = (
+            Response.objects.filter(session__topic=session.topic, created_at__gt=since)
+            .exclude(session=session)
+            .order_by('created_at').values_list('created_at', flat=True).first()
+        )
+        if next_other_response:
+            window = window.filter(created_at__lt=next_other_response)
+        if session.end_time:
+            window = window.filter(created_at__lte=session.end_time)
+        unanswered = list(window.values_list('id', flat=True)[:2])
+
+        ordered = list(
+            Question.objects.filter(id__in=answered).order_by('created_at', 'id').values_list('id', flat=True)
+        )
+        sessions.append((session.id, ordered, unanswered[0] if len(unanswered) == 1 else None))
+
+    picked = Counter(unanswered for _, _, unanswered in sessions if unanswered is not None)
+    links = []
+    for session_id, ordered, unanswered in sessions:
+        if unanswered is not None and picked[unanswered] == 1:
+            ordered = ordered + [unanswered]
+        for ordinal, question_id in enumerate(ordered, 1):
+            links.append(SessionQuestion(session_id=session_id, question_id=question_id, ordinal=ordinal))
+
+    SessionQuestion.objects.bulk_create(links, batch_size=500)
+
+    # asked_at is auto_now_add, which overrides values passed to bulk_create
+    asked_at = dict(Question.objects.filter(id__in={link.question_id for link in links}).values_list('id', 'created_at'))
+    for link in links:
+        SessionQuestion.objects.filter(session_id=link.session_id, ordinal=link.ordinal).update(
+            asked_at=asked_at[link.question_id]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_core', '0005_interviewreport_pdf'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionQuestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ordinal', models.PositiveIntegerField()),
+                ('asked_at', models.DateTimeField(auto_now_add=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='session_questions', to='interview_core.question')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='session_questions', to='interview_core.interviewsession')),
+            ],
+            options={
+                'ordering': ['session', 'ordinal'],
+                'constraints': [models.UniqueConstraint(fields=('session', 'ordinal'), name='unique_session_question_ordinal')],
+            },
+        ),
+        migrations.RunPython(backfill_session_questions, migrations.RunPython.noop),
+    ]
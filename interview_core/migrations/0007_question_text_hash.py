@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:05
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def intern_questions(apps, schema_editor):
+    """Hash every question, point sessions and responses at the oldest copy of each text and drop the rest"""
+    Question = apps.get_model('interview_core', 'Question')
+    Response = apps.get_model('interview_core', 'Response')
+    SessionQuestion = apps.get_model('interview_core', 'SessionQuestion')
+
+    canonical = {}
+    duplicates = {}
+    for question_id, text in Question.objects.order_by('id').values_list('id', 'text').iterator():
+        text_hash = hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+        if text_hash in canonical:
+            duplicates.setdefault(canonical[text_hash], []).append(question_id)
+        else:
+            canonical[text_hash] = question_id
+            Question.objects.filter(id=question_id).update(text_hash=text_hash, text=text.strip())
+
+    for canonical_id, duplicate_ids in duplicates.items():
+        Response.objects.filter(question_id__in=duplicate_ids).update(question_id=canonical_id)
+        SessionQuestion.objects.filter(question_id__in=duplicate_ids).update(question_id=canonical_id)
+        Question.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_core', '0006_sessionquestion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='text_hash',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.RunPython(intern_questions, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='question',
+            name='text_hash',
+            field=models.CharField(max_length=64, unique=True),
+        ),
+    ]
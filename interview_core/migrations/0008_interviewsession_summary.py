@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_core', '0007_question_text_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewsession',
+            name='summary',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='summary_turns',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
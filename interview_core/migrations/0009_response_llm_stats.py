@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_core', '0008_interviewsession_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='response',
+            name='llm_stats',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_core', '0009_response_llm_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewreport',
+            name='regenerate_after',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
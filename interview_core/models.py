@@ -1,7 +1,14 @@
 from django.db import models
 from django.contrib.auth.models import User
+import hashlib
 import json
 
+
+def question_text_hash(text):
+    """Content hash used to intern question text"""
+    return hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+
+
 class InterviewSession(models.Model):
     STATUS_CHOICES = [
         ('active', 'Active'),
@@ -14,19 +21,56 @@ class InterviewSession(models.Model):
     end_time = models.DateTimeField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
     total_score = models.IntegerField(default=0)
+    summary = models.TextField(blank=True, default='')  # Rolling summary of the answered turns, for the interviewer prompt
+    summary_turns = models.PositiveIntegerField(default=0)  # Number of answered turns folded into `summary`
 
     def __str__(self):
         return f"{self.topic} - {self.start_time.strftime('%Y-%m-%d %H:%M')}"
 
 class Question(models.Model):
+    """
+    Interned question text: identical text shares one row (and its audio). The order a
+    session asked its questions in is kept in SessionQuestion.
+    """
     text = models.TextField()
-    topic = models.CharField(max_length=100)
+    text_hash = models.CharField(max_length=64, unique=True)
+    topic = models.CharField(max_length=100)  # Topic the text was first asked for
     difficulty = models.CharField(max_length=20, choices=[('easy', 'Easy'), ('medium', 'Medium'), ('hard', 'Hard')], default='medium')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        self.text_hash = question_text_hash(self.text)
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def intern(cls, text, topic, difficulty='medium'):
+        """Return the canonical row for `text`, creating it on first use"""
+        question, _ = cls.objects.get_or_create(
+            text_hash=question_text_hash(text),
+            defaults={'text': text.strip(), 'topic': topic, 'difficulty': difficulty}
+        )
+        return question
+
     def __str__(self):
         return self.text[:50]
 
+class SessionQuestion(models.Model):
+    """A question as asked in a session; ordinal is its 1-based position in the interview"""
+    session = models.ForeignKey(InterviewSession, related_name='session_questions', on_delete=models.CASCADE)
+    question = models.ForeignKey(Question, related_name='session_questions', on_delete=models.CASCADE)
+    ordinal = models.PositiveIntegerField()
+    asked_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['session', 'ordinal']
+        constraints = [
+            # Also the (session, ordinal) index behind the current-question and count lookups
+            models.UniqueConstraint(fields=['session', 'ordinal'], name='unique_session_question_ordinal')
+        ]
+
+    def __str__(self):
+        return f"Q{self.ordinal} in Session {self.session_id}"
+
 class Response(models.Model):
     session = models.ForeignKey(InterviewSession, related_name='responses', on_delete=models.CASCADE)
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
@@ -34,7 +78,48 @@ class Response(models.Model):
     transcription = models.TextField(blank=True, null=True)
     ai_feedback = models.JSONField(blank=True, null=True)  # Stores detailed feedback, improvement tips
     score = models.IntegerField(default=0)  # 1-10
+    audio_stats = models.JSONField(blank=True, null=True)  # Durations from silence trimming: speech, leading/trailing silence, pauses
+    llm_stats = models.JSONField(blank=True, null=True)  # Ollama token counts and timings for the evaluation call, with the prompt variant
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"Response to {self.question.id} in Session {self.session.id}"
+
+class BackgroundJob(models.Model):
+    """A unit of work in the local DB-backed queue, drained by `manage.py process_jobs`"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    attempts = models.IntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.status})"
+
+class InterviewReport(models.Model):
+    """Generated evaluation report for a session, reused until the session's responses change"""
+    session = models.OneToOneField(InterviewSession, related_name='report', on_delete=models.CASCADE)
+    fingerprint = models.CharField(max_length=64)  # sha256 of the responses the report was built from
+    data = models.JSONField()
+    pdf = models.FileField(upload_to='reports/', blank=True)  # Named by sha256 of the PDF bytes
+    pdf_fingerprint = models.CharField(max_length=64, blank=True)  # report_version() of the data the PDF was rendered from
+    regenerate_after = models.DateTimeField(null=True, blank=True)  # Next retry of a fallback report
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Report for Session {self.session_id}"
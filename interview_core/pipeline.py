@@ -0,0 +1,288 @@
+"""
+Answer processing pipeline shared by the sync view, the async view and the job worker.
+
+Each entry point persists the candidate's Response first, then hands it to
+process_answer (or aprocess_answer) which transcribes, evaluates and prepares the
+next question. The returned dict is the JSON payload sent back to the browser.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from . import conversation, reports
+from .models import InterviewSession, Response, Question, SessionQuestion
+from .ai_service import ai_service
+
+CLOSING_QUESTION = "Thank you for your time. That concludes our interview."
+
+
+def question_audio_url(question):
+    """
+    Audio URL for a question. Already-synthesised text is served straight from the TTS cache.
+    Otherwise, in pipelined TTS mode this is the streamed endpoint, which starts playing
+    before the whole question is synthesised; without it the mp3 is rendered now.
+    """
+    if getattr(settings, 'TTS_PIPELINED', False):
+        return ai_service.cached_speech_url(question.text) or reverse('question_audio', args=[question.id])
+    return ai_service.text_to_speech(question.text)
+
+
+async def aquestion_audio_url(question):
+    """Async variant of question_audio_url"""
+    if getattr(settings, 'TTS_PIPELINED', False):
+        return ai_service.cached_speech_url(question.text) or reverse('question_audio', args=[question.id])
+    return await ai_service.atext_to_speech(question.text)
+
+
+def current_question(session):
+    """The question most recently asked in the session (index lookup on session, ordinal)"""
+    latest = SessionQuestion.objects.filter(session=session).select_related('question').order_by('-ordinal').first()
+    return latest.question if latest else None
+
+
+async def acurrent_question(session):
+    """Async variant of current_question"""
+    latest = await SessionQuestion.objects.filter(session=session).select_related('question').order_by('-ordinal').afirst()
+    return latest.question if latest else None
+
+
+def questions_asked(session):
+    """Number of questions asked so far in the session"""
+    return SessionQuestion.objects.filter(session=session).order_by('-ordinal').values_list('ordinal', flat=True).first() or 0
+
+
+async def aquestions_asked(session):
+    """Async variant of questions_asked"""
+    return await SessionQuestion.objects.filter(session=session).order_by('-ordinal').values_list('ordinal', flat=True).afirst() or 0
+
+
+def ask_question(session, text, ordinal=None, difficulty='medium'):
+    """
+    Record `text` as the session's `ordinal`-th question, reusing the interned row for identical text.
+
+    Without an ordinal the next free one is allocated while holding the session row, so
+    concurrent answers in one session can't claim the same position. Databases without
+    row locks (SQLite) can still collide, so the allocation is retried on IntegrityError.
+    """
+    for attempt in range(3):
+        try:
+            with transaction.atomic():
+                position = ordinal
+                if position is None:
+                    InterviewSession.objects.select_for_update().only('id').get(id=session.id)
+                    position = questions_asked(session) + 1
+                question = Question.intern(text, session.topic, difficulty)
+                SessionQuestion.objects.create(session=session, question=question, ordinal=position)
+            return question
+        except IntegrityError:
+            if ordinal is not None or attempt == 2:
+                raise
+
+
+def _interview_complete(total_questions, next_q_text):
+    # End after 10-12 questions for a comprehensive interview
+    return total_questions >= 12 or "concludes" in next_q_text.lower() or "thank you for your time" in next_q_text.lower()
+
+
+def _complete_session(session):
+    """Mark the session completed and start rendering its PDF report in the background"""
+    completed = InterviewSession.objects.filter(id=session.id, status='active').update(
+        status='completed',
+        end_time=timezone.now()
+    )
+    if completed and getattr(settings, 'REPORT_PDF_BACKGROUND', True):
+        reports.request_report_pdf(session)
+
+
+def _result_payload(response_obj, next_question=None, audio_url=None):
+    return {
+        "feedback": response_obj.ai_feedback,
+        "score": response_obj.score,
+        "next_question": {
+            "id": next_question.id,
+            "text": next_question.text
+        } if next_question else None,
+        "audio_url": audio_url,
+        "interview_complete": next_question is None
+    }
+
+
+def process_answer(response_obj, audio=None):
+    """
+    Run transcription, evaluation and next-question TTS for a saved Response.
+    Pass the uploaded bytes as `audio` to decode them in memory instead of re-reading the saved file.
+    """
+    session = response_obj.session
+
+    # 1. Trim silence and transcribe the audio
+    samples, audio_stats = ai_service.prepare_audio(audio if audio is not None else response_obj.audio_file.path)
+    transcript = ai_service.transcribe_audio(samples)
+    response_obj.transcription = transcript
+    response_obj.audio_stats = audio_stats
+    response_obj.save(update_fields=['transcription', 'audio_stats'])
+
+    # 2. Recent conversation for context (cached per session; one query when cold)
+    state = conversation.load_state(session.id, response_obj.id)
+    history, summary = conversation.prompt_context(state, response_obj)
+
+    # 3. Get AI evaluation and next question
+    ai_result = ai_service.generate_response(
+        transcript, history, session.topic, question_number=conversation.next_question_number(state), summary=summary
+    )
+
+    # Update current response with feedback
+    response_obj.ai_feedback = ai_result.get('feedback', 'Thank you for your response.')
+    response_obj.score = ai_result.get('score', 7)
+    response_obj.llm_stats = ai_result.get('llm_stats')
+    response_obj.save(update_fields=['ai_feedback', 'score', 'llm_stats'])
+    conversation.record_turn(state, response_obj)
+
+    # 4. Create next question
+    next_q_text = ai_result.get('next_question', CLOSING_QUESTION)
+    total_questions = questions_asked(session)
+    if _interview_complete(total_questions, next_q_text):
+        _complete_session(session)
+        return _result_payload(response_obj)
+
+    next_question = ask_question(session, next_q_text)
+    conversation.request_summary(session.id)
+
+    # 5. Generate TTS for next question
+    audio_url = question_audio_url(next_question)
+    return _result_payload(response_obj, next_question, audio_url)
+
+
+async def _atranscribe_with_history(response_obj, audio=None):
+    """Stages 1-2 of the async pipeline. Returns (response_obj, transcript, state)."""
+    response_obj = await Response.objects.select_related('session', 'question').aget(id=response_obj.id)
+    session = response_obj.session
+
+    # 1. Trim and transcribe the audio while the conversation state loads
+    async def transcribe():
+        # Decoding and trimming are CPU work; keep them off the event loop
+        samples, audio_stats = await asyncio.to_thread(
+            ai_service.prepare_audio, audio if audio is not None else response_obj.audio_file.path
+        )
+        return await ai_service.atranscribe_audio(samples), audio_stats
+
+    (transcript, audio_stats), state = await asyncio.gather(
+        transcribe(),
+        conversation.aload_state(session.id, response_obj.id)
+    )
+    response_obj.transcription = transcript
+    response_obj.audio_stats = audio_stats
+    await response_obj.asave(update_fields=['transcription', 'audio_stats'])
+    return response_obj, transcript, state
+
+
+async def _afinish_turn(response_obj, ai_result, state):
+    """Stages 4-5 of the async pipeline: store the evaluation and prepare the next question"""
+    session = response_obj.session
+
+    response_obj.ai_feedback = ai_result.get('feedback', 'Thank you for your response.')
+    response_obj.score = ai_result.get('score', 7)
+    response_obj.llm_stats = ai_result.get('llm_stats')
+    await response_obj.asave(update_fields=['ai_feedback', 'score', 'llm_stats'])
+    await conversation.arecord_turn(state, response_obj)
+
+    # 4. Create next question
+    next_q_text = ai_result.get('next_question', CLOSING_QUESTION)
+    total_questions = await aquestions_asked(session)
+    if _interview_complete(total_questions, next_q_text):
+        await sync_to_async(_complete_session)(session)
+        return _result_payload(response_obj)
+
+    next_question = await sync_to_async(ask_question)(session, next_q_text)
+    await sync_to_async(conversation.request_summary)(session.id)
+
+    # 5. Generate TTS for next question
+    audio_url = await aquestion_audio_url(next_question)
+    return _result_payload(response_obj, next_question, audio_url)
+
+
+async def aprocess_answer(response_obj, audio=None):
+    """
+    Async variant of process_answer for the ASGI entry point.
+
+    Whisper runs on a bounded executor while the Ollama call and Edge-TTS run as
+    coroutines, so a single worker can hold many in-flight interviews.
+    """
+    response_obj, transcript, state = await _atranscribe_with_history(response_obj, audio)
+
+    # 3. Get AI evaluation and next question
+    history, summary = conversation.prompt_context(state, response_obj)
+    ai_result = await ai_service.agenerate_response(
+        transcript,
+        history,
+        response_obj.session.topic,
+        question_number=conversation.next_question_number(state),
+        summary=summary
+    )
+    return await _afinish_turn(response_obj, ai_result, state)
+
+
+async def astream_answer(response_obj, audio=None):
+    """
+    Streaming variant of aprocess_answer.
+
+    Yields (event, data) pairs: 'transcript' once Whisper is done, 'feedback' text
+    deltas as the interviewer model generates them, and a final 'result' carrying
+    the same payload process_answer returns.
+    """
+    response_obj, transcript, state = await _atranscribe_with_history(response_obj, audio)
+    yield 'transcript', {"text": transcript}
+
+    ai_result = None
+    history, summary = conversation.prompt_context(state, response_obj)
+    events = ai_service.astream_response(
+        transcript,
+        history,
+        response_obj.session.topic,
+        question_number=conversation.next_question_number(state),
+        summary=summary
+    )
+    async for kind, data in events:
+        if kind == 'feedback':
+            yield 'feedback', {"text": data}
+        else:
+            ai_result = data
+
+    yield 'result', await _afinish_turn(response_obj, ai_result, state)
+
+
+def _stored_result(response_obj):
+    """
+    The payload for an answer that has already been processed, or None.
+
+    An answer is done once it has feedback and either the session has a question asked
+    after it or the session is complete.
+    """
+    if not response_obj.ai_feedback:
+        return None
+    following = SessionQuestion.objects.filter(
+        session=response_obj.session,
+        asked_at__gte=response_obj.created_at
+    ).select_related('question').order_by('ordinal').first()
+    if following is not None:
+        return _result_payload(response_obj, following.question, question_audio_url(following.question))
+    if response_obj.session.status == 'completed':
+        return _result_payload(response_obj)
+    return None
+
+
+def run_process_response_job(job):
+    """
+    Job handler: process an uploaded answer queued by SubmitResponseView.
+
+    Retries (after a failure or an expired lease) return the stored result if an earlier
+    attempt got that far, rather than evaluating the answer and asking a question again.
+    """
+    response_obj = Response.objects.select_related('session', 'question').get(id=job.payload['response_id'])
+    stored = _stored_result(response_obj)
+    if stored is not None:
+        return stored
+    return process_answer(response_obj)
@@ -0,0 +1,173 @@
+"""
+File-backed question banks and scoring keywords.
+
+Opening questions, fallback question banks, generic fallback questions and per-category
+scoring keywords live in JSON files under QUESTION_BANK_DIR (interview_core/data by
+default). `{topic}` in a question is replaced by the candidate's job role.
+
+    question_banks.json  {"openings": {tech or category: question},
+                          "generic": [question, ...],
+                          "banks": {category: {tech or "general": [question, ...]}}}
+    keywords.json        {category: [keyword, ...]}
+
+The files are parsed once into flat indexes: questions keyed by (category, tech, ordinal)
+and keywords as one frozenset per category, so lookups on the fallback path are single
+dict hits. The files' mtimes are checked at most every QUESTION_BANK_RELOAD_INTERVAL
+seconds and the indexes rebuilt when they change, so banks can be edited or extended
+without a restart. A file that fails to parse, or has an empty bank, an empty generic list
+or no General Technical opening, is reported and the previous index kept.
+"""
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+
+from .roles import GENERAL_CATEGORY
+
+QUESTIONS_FILE = 'question_banks.json'
+KEYWORDS_FILE = 'keywords.json'
+GENERAL_BANK = 'general'
+DEFAULT_CATEGORY = "Software Development"  # Bank for categories without one of their own
+
+
+class _Index:
+    def __init__(self, questions, keywords):
+        _validate(questions)
+        self.openings = questions.get('openings', {})
+        self.generic = questions.get('generic', [])
+        self.questions = {}  # (category, tech, ordinal) -> question
+        self.lengths = {}  # (category, tech) -> number of questions
+        self.tech_banks = {}  # tech -> (category, tech) of the first bank for it
+        for category, banks in questions.get('banks', {}).items():
+            for tech, bank in banks.items():
+                for ordinal, text in enumerate(bank, 1):
+                    self.questions[(category, tech, ordinal)] = text
+                self.lengths[(category, tech)] = len(bank)
+                if tech != GENERAL_BANK:
+                    self.tech_banks.setdefault(tech, (category, tech))
+        self.keywords = {category: frozenset(words) for category, words in keywords.items()}
+        self.resolved = {}  # (category, tech) -> bank key, filled on first use
+
+    def bank(self, category, tech):
+        """Bank used for a role: its technology's, else its category's, else the default"""
+        key = (category, tech)
+        if key not in self.resolved:
+            for candidate in [(category, tech), self.tech_banks.get(tech), (category, GENERAL_BANK), (DEFAULT_CATEGORY, GENERAL_BANK)]:
+                if candidate in self.lengths:
+                    self.resolved[key] = candidate
+                    break
+            else:
+                self.resolved[key] = None
+        return self.resolved[key]
+
+
+def _validate(questions):
+    """Raise ValueError for banks that would parse but fail at lookup time"""
+    if not questions.get('openings', {}).get(GENERAL_CATEGORY):
+        raise ValueError(f"{QUESTIONS_FILE}: no '{GENERAL_CATEGORY}' opening question")
+    if not questions.get('generic'):
+        raise ValueError(f"{QUESTIONS_FILE}: 'generic' question list is empty")
+    for category, banks in questions.get('banks', {}).items():
+        for tech, bank in banks.items():
+            if not isinstance(bank, list) or not bank:
+                raise ValueError(f"{QUESTIONS_FILE}: bank '{category}' / '{tech}' has no questions")
+
+
+def _fill(text, topic):
+    return text.replace('{topic}', topic)
+
+
+class QuestionBank:
+    def __init__(self, directory=None, reload_interval=None):
+        self._directory = directory
+        self._reload_interval = reload_interval
+        self._index = None
+        self._mtimes = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self):
+        return self._directory or getattr(
+            settings, 'QUESTION_BANK_DIR', os.path.join(os.path.dirname(__file__), 'data')
+        )
+
+    def _paths(self):
+        return [os.path.join(self.directory, name) for name in (QUESTIONS_FILE, KEYWORDS_FILE)]
+
+    def _load(self, paths):
+        data = []
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                data.append(json.load(f))
+        return _Index(*data)
+
+    @property
+    def index(self):
+        """The current index, reloaded first if a data file changed"""
+        interval = self._reload_interval
+        if interval is None:
+            interval = getattr(settings, 'QUESTION_BANK_RELOAD_INTERVAL', 2.0)
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < interval:
+            return self._index
+
+        with self._lock:
+            if self._index is not None and now - self._checked_at < interval:
+                return self._index
+            self._checked_at = now
+            paths = self._paths()
+            mtimes = None
+            try:
+                mtimes = [os.path.getmtime(path) for path in paths]
+                if mtimes == self._mtimes:
+                    return self._index
+                index = self._load(paths)
+            except (OSError, ValueError) as e:
+                if self._index is None:
+                    raise
+                if mtimes != self._mtimes:
+                    print(f"Error reloading question banks, keeping the previous ones: {e}")
+                    self._mtimes = mtimes  # Don't re-report until the files change again
+                return self._index
+            if self._mtimes is not None:
+                print(f"Question banks reloaded from {self.directory}")
+            self._index, self._mtimes = index, mtimes
+        return self._index
+
+    def opening(self, category, tech, topic):
+        openings = self.index.openings
+        text = openings.get(tech) or openings.get(category) or openings[GENERAL_CATEGORY]
+        return _fill(text, topic)
+
+    def question(self, category, tech, ordinal, topic):
+        """The role's `ordinal`-th fallback question (1-based; past the end, the last one)"""
+        index = self.index
+        key = index.bank(category, tech)
+        if key is None:
+            return None
+        ordinal = max(1, min(ordinal, index.lengths[key]))
+        return _fill(index.questions[key + (ordinal,)], topic)
+
+    def questions(self, category, tech, topic):
+        """The whole fallback bank for a role, in order"""
+        index = self.index
+        key = index.bank(category, tech)
+        if key is None:
+            return []
+        return [_fill(index.questions[key + (ordinal,)], topic) for ordinal in range(1, index.lengths[key] + 1)]
+
+    def generic_question(self, ordinal, topic):
+        generic = self.index.generic
+        return _fill(generic[max(1, min(ordinal, len(generic))) - 1], topic)
+
+    def generic_questions(self, topic):
+        return [_fill(text, topic) for text in self.index.generic]
+
+    def keywords(self, category):
+        return self.index.keywords.get(category, frozenset())
+
+
+question_bank = QuestionBank()
@@ -0,0 +1,207 @@
+"""
+Stored interview reports.
+
+generate_comprehensive_report is a long LLM call, so a session's report is generated
+once and kept in InterviewReport together with a fingerprint of the responses it was
+built from. Later page views and PDF downloads read it back; it is only regenerated
+when a response changes or when the stored copy is a fallback report and Ollama is
+available again. A fallback is retried at most once per REPORT_REGENERATE_BACKOFF
+seconds, so while generation keeps failing page views stay DB reads.
+
+PDFs are rendered by a background job (kind `render_report_pdf`) queued when the
+interview completes, and stored under MEDIA_ROOT/reports named by their content hash,
+so downloads just stream a file. A PDF is tied to the version (hash) of the report data
+it was rendered from, so a regenerated report is never served from an older PDF.
+"""
+import hashlib
+import json
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from . import jobs
+from .models import BackgroundJob, InterviewReport, InterviewSession, Response
+from .ai_service import ai_service
+
+# WeasyPrint font configuration, built once per worker process
+_font_config = None
+
+
+def session_report_data(session, responses):
+    """session_data input for generate_comprehensive_report"""
+    return {
+        'student_name': 'Student',  # Can be extended with user model
+        'topic': session.topic,
+        'interview_type': 'General',  # Can be extended
+        'responses': [
+            {
+                'question': resp.question.text,
+                'answer': resp.transcription,
+                'score': resp.score,
+                'feedback': resp.ai_feedback,
+                'time_taken': 0  # Can be tracked if needed
+            }
+            for resp in responses
+        ]
+    }
+
+
+def report_fingerprint(session_data):
+    """Stable hash of everything the report is generated from"""
+    encoded = json.dumps(session_data, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def report_version(data):
+    """Hash of a generated report; identifies the PDF rendered from it"""
+    return report_fingerprint(data)
+
+
+def _load_session_data(session):
+    responses = list(Response.objects.filter(session=session).select_related('question').order_by('created_at'))
+    session_data = session_report_data(session, responses)
+    return responses, session_data, report_fingerprint(session_data)
+
+
+def get_session_report(session):
+    """
+    Return (report, responses) for a session, generating the report only if there is no
+    stored copy for the current responses.
+    """
+    responses, session_data, fingerprint = _load_session_data(session)
+
+    stored = InterviewReport.objects.filter(session=session).first()
+    if stored and stored.fingerprint == fingerprint:
+        if not _is_fallback(stored.data) or not _claim_regeneration(stored):
+            return stored.data, responses
+
+    report = ai_service.generate_comprehensive_report(session_data)
+    # A fallback is not retried again before the backoff expires
+    regenerate_after = _next_attempt() if _is_fallback(report) else None
+    try:
+        InterviewReport.objects.update_or_create(
+            session=session,
+            defaults={'fingerprint': fingerprint, 'data': report, 'regenerate_after': regenerate_after}
+        )
+    except IntegrityError:
+        # Another request stored the same session's report first
+        InterviewReport.objects.filter(session=session).update(
+            fingerprint=fingerprint, data=report, regenerate_after=regenerate_after
+        )
+    return report, responses
+
+
+def _is_fallback(report):
+    return report.get('metadata', {}).get('fallback', False)
+
+
+def _next_attempt():
+    return timezone.now() + timedelta(seconds=getattr(settings, 'REPORT_REGENERATE_BACKOFF', 600))
+
+
+def _claim_regeneration(stored):
+    """
+    True if this request should retry a stored fallback report now: Ollama is available and
+    the backoff has expired. Claiming pushes the backoff forward, so concurrent views of the
+    same report don't all start a generation.
+    """
+    if not ai_service.check_ollama_availability():
+        return False
+    now = timezone.now()
+    return bool(
+        InterviewReport.objects.filter(id=stored.id)
+        .filter(Q(regenerate_after__isnull=True) | Q(regenerate_after__lte=now))
+        .update(regenerate_after=_next_attempt())
+    )
+
+
+def stored_report_pdf(session):
+    """Path of the session's PDF if one has been rendered from its current report, else None"""
+    stored = InterviewReport.objects.filter(session=session).first()
+    if not stored or not stored.pdf:
+        return None
+    _, _, fingerprint = _load_session_data(session)
+    if (
+        stored.fingerprint != fingerprint
+        or stored.pdf_fingerprint != report_version(stored.data)
+        or not os.path.exists(stored.pdf.path)
+    ):
+        return None
+    return stored.pdf.path
+
+
+def request_report_pdf(session):
+    """
+    The session's PDF render job: the queued or running one if there is one, else a new one.
+
+    A render that failed (out of attempts) for the current report is returned as is rather
+    than queued again, so a broken WeasyPrint or font setup ends in an error instead of an
+    endless series of jobs. A new render is queued once the report has changed since.
+    """
+    job = BackgroundJob.objects.filter(
+        kind='render_report_pdf',
+        payload__session_id=session.id
+    ).order_by('-created_at', '-id').first()
+    if job is not None and job.status in ('pending', 'running'):
+        return job
+    if job is not None and job.status == 'failed':
+        stored = InterviewReport.objects.filter(session=session).first()
+        if stored is None or job.finished_at is None or stored.updated_at <= job.finished_at:
+            return job
+    return jobs.enqueue('render_report_pdf', session_id=session.id)
+
+
+def _font_configuration():
+    global _font_config
+    if _font_config is None:
+        from weasyprint.text.fonts import FontConfiguration
+        _font_config = FontConfiguration()
+    return _font_config
+
+
+def render_report_pdf(session):
+    """Render the session's report to a PDF stored under MEDIA_ROOT/reports; returns its path"""
+    from weasyprint import HTML
+
+    report, responses = get_session_report(session)
+    stored = InterviewReport.objects.get(session=session)
+    version = report_version(stored.data)
+    if stored.pdf and stored.pdf_fingerprint == version and os.path.exists(stored.pdf.path):
+        return stored.pdf.path
+
+    html_string = render_to_string('interview_core/report_pdf.html', {
+        'session': session,
+        'report': report,
+        'responses': responses
+    })
+    pdf = HTML(string=html_string, base_url=str(settings.BASE_DIR)).write_pdf(font_config=_font_configuration())
+
+    # Content-addressed name: identical reports share one file
+    output_dir = os.path.join(settings.MEDIA_ROOT, 'reports')
+    os.makedirs(output_dir, exist_ok=True)
+    filename = f"{hashlib.sha256(pdf).hexdigest()}.pdf"
+    file_path = os.path.join(output_dir, filename)
+    temp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(pdf)
+    os.replace(temp_path, file_path)
+
+    # By version, so a PDF rendered while the report was being regenerated is never served
+    stored.pdf.name = f"reports/{filename}"
+    stored.pdf_fingerprint = version
+    stored.save(update_fields=['pdf', 'pdf_fingerprint', 'updated_at'])
+    return file_path
+
+
+def run_render_report_pdf_job(job):
+    """Job handler: render the PDF report for a completed session"""
+    session = InterviewSession.objects.get(id=job.payload['session_id'])
+    render_report_pdf(session)
+    stored = InterviewReport.objects.get(session=session)
+    return {'session_id': session.id, 'pdf_url': stored.pdf.url}
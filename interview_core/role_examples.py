@@ -0,0 +1,43 @@
+"""
+Example job roles with the classification they should get. Used by the tests and by
+`manage.py bench_roles`.
+"""
+from .roles import GENERAL_CATEGORY
+
+# topic, expected category, expected technology
+ROLE_TABLE = [
+    ("Python Developer", "Software Development", 'python'),
+    ("Senior Java Engineer", "Software Development", 'java'),
+    ("JavaScript Developer", "Software Development", 'javascript'),
+    ("Node.js Backend Developer", "Web Development", 'javascript'),
+    ("Django Developer", "Software Development", 'python'),
+    ("C++ Programmer", "Software Development", None),
+    ("Software Engineer", "Software Development", None),
+    ("Web Developer", "Web Development", None),
+    ("Full-Stack Developer", "Web Development", None),
+    ("Frontend Engineer (React)", "Web Development", None),
+    ("React Native Developer", "Mobile Development", None),
+    ("iOS Developer", "Mobile Development", None),
+    ("Data Scientist", "Data Science & Analytics", None),
+    ("ML Engineer", "Data Science & Analytics", None),
+    ("AI Researcher", "Data Science & Analytics", None),
+    ("DevOps Engineer", "DevOps & Cloud", None),
+    ("AWS Cloud Engineer", "DevOps & Cloud", None),
+    ("QA Engineer", "Quality Assurance", None),
+    ("SDET", "Quality Assurance", None),
+    ("Database Administrator", "Database Administration", None),
+    ("SQL Developer", "Database Administration", None),
+    ("Cybersecurity Analyst", "Cybersecurity", None),
+    ("UI/UX Designer", "UI/UX Design", None),
+    ("Product Manager", "Project Management", None),
+    ("Scrum Master", "Project Management", None),
+    ("Business Analyst", "Business Analysis", None),
+    ("BA", "Business Analysis", None),
+    ("Network Engineer", "Network Engineering", None),
+    # Substrings that used to misfire
+    ("Database Engineer", "Database Administration", None),  # 'ba' in "database"
+    ("Email Marketing Specialist", GENERAL_CATEGORY, None),  # 'ai' in "email"
+    ("Maintenance Technician", GENERAL_CATEGORY, None),  # 'ai' in "maintenance"
+    ("Build Engineer", GENERAL_CATEGORY, None),  # 'ui' in "build"
+    ("Accountant", GENERAL_CATEGORY, None),
+]
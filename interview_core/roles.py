@@ -0,0 +1,96 @@
+"""
+Role classification for interview topics.
+
+`classify(topic)` maps a free-text job role ("Senior Python Developer", "UI/UX Designer")
+to (category, tech). Opening questions, the interviewer prompt, fallback question banks
+and keyword scoring all use it, so they always agree on a role.
+
+Every keyword below is compiled once into a single regex, and matching is whole-word only:
+'ba' doesn't match "database" and 'ai' doesn't match "email". A topic is scanned once;
+when several keywords match, the category listed first in CATEGORIES wins, so specific
+roles ("Web Developer") beat the generic Software Development bucket. Results are
+memoized per topic.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+GENERAL_CATEGORY = "General Technical"
+
+Role = namedtuple('Role', ['category', 'tech'])
+
+# Category -> keywords, in priority order
+CATEGORIES = [
+    ("Data Science & Analytics", [
+        'data scientist', 'data science', 'data analyst', 'data analytics', 'data engineer',
+        'machine learning', 'ml', 'ml engineer', 'ai', 'artificial intelligence', 'deep learning',
+    ]),
+    ("Mobile Development", ['mobile', 'android', 'ios', 'flutter', 'react native', 'kotlin', 'swift']),
+    ("Web Development", [
+        'web', 'frontend', 'front end', 'backend', 'back end', 'fullstack', 'full stack',
+        'react', 'angular', 'vue', 'node', 'node.js', 'nodejs',
+    ]),
+    ("DevOps & Cloud", ['devops', 'cloud', 'aws', 'azure', 'gcp', 'kubernetes', 'docker', 'sre', 'site reliability']),
+    ("Quality Assurance", ['qa', 'quality assurance', 'test', 'tester', 'testing', 'test engineer', 'sdet', 'automation']),
+    ("Database Administration", ['database', 'sql', 'dba', 'mongodb', 'postgresql', 'mysql', 'oracle']),
+    ("Cybersecurity", [
+        'security', 'cybersecurity', 'cyber security', 'infosec', 'penetration', 'penetration tester',
+        'ethical hacking', 'ethical hacker',
+    ]),
+    ("UI/UX Design", ['ui', 'ux', 'design', 'designer', 'product designer', 'graphic']),
+    ("Project Management", ['project manager', 'program manager', 'product manager', 'scrum', 'scrum master', 'agile']),
+    ("Business Analysis", ['business analyst', 'ba', 'systems analyst', 'requirements']),
+    ("Network Engineering", ['network', 'networking', 'network engineer', 'network admin', 'cisco', 'ccna', 'routing', 'switching']),
+    ("Software Development", [
+        'python', 'java', 'c++', 'c#', 'javascript', 'js', 'typescript', 'golang',
+        'developer', 'programmer', 'software engineer', 'software developer',
+    ]),
+]
+
+# Technology -> keywords, in priority order; these pick the technology-specific banks
+TECHNOLOGIES = [
+    ('python', ['python', 'django', 'flask']),
+    ('java', ['java', 'spring', 'spring boot']),
+    ('javascript', ['javascript', 'js', 'typescript', 'node.js', 'nodejs']),
+]
+
+_CATEGORY_RANK = {}
+for _rank, (_category, _keywords) in enumerate(CATEGORIES):
+    for _keyword in _keywords:
+        _CATEGORY_RANK.setdefault(_keyword, (_rank, _category))
+
+_TECH_RANK = {}
+for _rank, (_tech, _keywords) in enumerate(TECHNOLOGIES):
+    for _keyword in _keywords:
+        _TECH_RANK.setdefault(_keyword, (_rank, _tech))
+
+# Longest keywords first so 'react native' wins over 'react' at the same position;
+# alphanumeric lookarounds instead of \b so keywords like 'c++' and 'node.js' work
+_KEYWORD_PATTERN = re.compile(
+    r'(?<![a-z0-9])(?:'
+    + '|'.join(re.escape(keyword) for keyword in sorted(set(_CATEGORY_RANK) | set(_TECH_RANK), key=len, reverse=True))
+    + r')(?![a-z0-9+#])'
+)
+_SEPARATORS = re.compile(r'[\s_-]+')
+
+
+def normalise_topic(topic):
+    """Lowercase with hyphens, underscores and runs of whitespace collapsed to one space"""
+    return _SEPARATORS.sub(' ', topic.lower()).strip()
+
+
+@lru_cache(maxsize=1024)
+def _classify(topic):
+    category = tech = None
+    for match in _KEYWORD_PATTERN.finditer(topic):
+        keyword = match.group()
+        if keyword in _CATEGORY_RANK and (category is None or _CATEGORY_RANK[keyword] < category):
+            category = _CATEGORY_RANK[keyword]
+        if keyword in _TECH_RANK and (tech is None or _TECH_RANK[keyword] < tech):
+            tech = _TECH_RANK[keyword]
+    return Role(category[1] if category else GENERAL_CATEGORY, tech[1] if tech else None)
+
+
+def classify(topic):
+    """Role(category, tech) for a job role; tech is 'python', 'java', 'javascript' or None"""
+    return _classify(normalise_topic(topic or ''))
@@ -5,11 +5,13 @@ class InterviewSessionSerializer(serializers.ModelSerializer):
     class Meta:
         model = InterviewSession
         fields = '__all__'
+        read_only_fields = ['summary', 'summary_turns']
 
 class QuestionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Question
         fields = '__all__'
+        read_only_fields = ['text_hash']
 
 class ResponseSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,74 @@
+"""
+Helpers for pushing partial results to the browser as Server-Sent Events.
+"""
+import json
+import re
+
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+def sse_event(event, data):
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class JSONStringFieldStream:
+    """
+    Incrementally extracts the value of one string field from JSON that arrives in chunks.
+
+    feed() returns the newly decoded characters of the field's value as soon as they
+    are complete, so text can be shown while the model is still generating the rest
+    of the object. Escape sequences split across chunks are held back until complete.
+    """
+
+    def __init__(self, field):
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ''
+        self._pos = None  # Index in _buffer of the first undecoded value character
+        self.done = False
+
+    def feed(self, chunk):
+        if self.done:
+            return ''
+        self._buffer += chunk
+
+        if self._pos is None:
+            match = self._key.search(self._buffer)
+            if not match:
+                return ''
+            self._pos = match.end()
+
+        buf = self._buffer
+        i = self._pos
+        decoded = []
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self.done = True
+                i += 1
+                break
+            if ch == '\\':
+                if i + 1 >= len(buf):
+                    break
+                if buf[i + 1] == 'u':
+                    if i + 6 > len(buf):
+                        break
+                    length = 6
+                    if 0xD800 <= int(buf[i + 2:i + 6], 16) <= 0xDBFF:
+                        # High surrogate: decode it together with the \uXXXX low half that follows
+                        rest = buf[i + 6:i + 12]
+                        if len(rest) < 6 and '\\u'.startswith(rest[:2]):
+                            break  # The low half may still be arriving
+                        if rest.startswith('\\u'):
+                            length = 12
+                    decoded.append(json.loads(f'"{buf[i:i + length]}"'))
+                    i += length
+                    continue
+                decoded.append(_ESCAPES.get(buf[i + 1], buf[i + 1]))
+                i += 2
+                continue
+            decoded.append(ch)
+            i += 1
+
+        self._pos = i
+        return ''.join(decoded)
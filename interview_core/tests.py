@@ -0,0 +1,295 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from . import conversation, jobs, roles
+from .audio import SAMPLE_RATE, trim_silence
+from .circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from .llm_client import AdmissionTimeout, FairLimiter
+from .models import BackgroundJob, InterviewSession, Question, Response
+from .role_examples import ROLE_TABLE
+from .streaming import JSONStringFieldStream
+
+
+class ClassifyTests(SimpleTestCase):
+    def test_role_table(self):
+        for topic, category, tech in ROLE_TABLE:
+            with self.subTest(topic=topic):
+                self.assertEqual(roles.classify(topic), (category, tech))
+
+
+class ConversationStateTests(TestCase):
+    def setUp(self):
+        self.session = InterviewSession.objects.create(topic="Python Developer")
+        conversation._cache().delete(conversation._cache_key(self.session.id))  # Force a rebuild from the DB
+        self.responses = [
+            Response.objects.create(
+                session=self.session,
+                question=Question.intern(f"Question {number}?", self.session.topic),
+                audio_file=f"responses/{number}.webm",
+                transcription=f"Answer {number}",
+                score=number
+            )
+            for number in range(1, 5)
+        ]
+
+    def test_rebuilt_state_excludes_later_answers(self):
+        state = conversation.load_state(self.session.id, self.responses[1].id)
+        self.assertEqual(state['turns'], 1)
+        self.assertEqual([entry['answer'] for entry in state['window']], ["Answer 1"])
+        self.assertEqual(state['last_response_id'], self.responses[0].id)
+
+    def test_summary_of_later_turns_is_not_used(self):
+        self.session.summary = "Covers all four answers"
+        self.session.summary_turns = 4
+        self.session.save()
+        response = Response.objects.select_related('session', 'question').get(id=self.responses[2].id)
+        state = conversation.load_state(self.session.id, response.id)
+        history, summary = conversation.prompt_context(state, response)
+        self.assertIsNone(summary)
+        self.assertEqual([entry['answer'] for entry in history], ["Answer 1", "Answer 2", "Answer 3"])
+
+
+class JobQueueTests(TestCase):
+    def test_claim_next_takes_the_oldest_pending_job(self):
+        first = jobs.enqueue('process_response', response_id=1)
+        jobs.enqueue('process_response', response_id=2)
+
+        claimed = jobs.claim_next('worker-1')
+        self.assertEqual(claimed.id, first.id)
+        self.assertEqual(claimed.status, 'running')
+        self.assertEqual(claimed.worker, 'worker-1')
+        self.assertEqual(claimed.attempts, 1)
+        self.assertNotEqual(jobs.claim_next('worker-2').id, first.id)
+        self.assertIsNone(jobs.claim_next('worker-3'))
+
+    def test_claim_next_filters_by_kind(self):
+        jobs.enqueue('process_response', response_id=1)
+        summary = jobs.enqueue('summarise_session', session_id=1)
+        self.assertEqual(jobs.claim_next('worker', kinds=['summarise_session']).id, summary.id)
+        self.assertIsNone(jobs.claim_next('worker', kinds=['summarise_session']))
+
+    def test_enqueue_rejects_unknown_kinds(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue('no_such_kind')
+
+    @override_settings(JOB_LEASE_SECONDS=60, JOB_MAX_ATTEMPTS=3)
+    def test_requeue_stale(self):
+        retry = jobs.enqueue('process_response', response_id=1)
+        exhausted = jobs.enqueue('process_response', response_id=2)
+        fresh = jobs.enqueue('process_response', response_id=3)
+        expired = timezone.now() - timedelta(seconds=120)
+        BackgroundJob.objects.filter(id=retry.id).update(status='running', started_at=expired, attempts=1)
+        BackgroundJob.objects.filter(id=exhausted.id).update(status='running', started_at=expired, attempts=3)
+        BackgroundJob.objects.filter(id=fresh.id).update(status='running', started_at=timezone.now(), attempts=1)
+
+        self.assertEqual(jobs.requeue_stale(), (1, 1))
+        statuses = dict(BackgroundJob.objects.values_list('id', 'status'))
+        self.assertEqual(statuses, {retry.id: 'pending', exhausted.id: 'failed', fresh.id: 'running'})
+
+
+class JSONStringFieldStreamTests(SimpleTestCase):
+    DOCUMENT = (
+        '{"score": 7, "feedback": "Line one\\nsaid \\"hi\\" \\\\ caf\\u00e9 \\ud83d\\ude00 done", '
+        '"next_question": "Next?"}'
+    )
+
+    def feed_in_chunks(self, size):
+        stream = JSONStringFieldStream('feedback')
+        text = ''.join(stream.feed(self.DOCUMENT[i:i + size]) for i in range(0, len(self.DOCUMENT), size))
+        return stream, text
+
+    def test_escapes_split_across_chunks(self):
+        expected = json.loads(self.DOCUMENT)['feedback']
+        for size in range(1, 16):
+            with self.subTest(chunk_size=size):
+                stream, text = self.feed_in_chunks(size)
+                self.assertEqual(text, expected)
+                self.assertTrue(stream.done)
+
+    def test_text_is_released_before_the_value_ends(self):
+        stream = JSONStringFieldStream('feedback')
+        self.assertEqual(stream.feed('{"feed'), '')
+        self.assertEqual(stream.feed('back": "Good an'), 'Good an')
+        self.assertEqual(stream.feed('swer\\'), 'swer')  # Escape held back until complete
+        self.assertEqual(stream.feed('n", "score": 8}'), '\n')
+        self.assertTrue(stream.done)
+        self.assertEqual(stream.feed('more'), '')
+
+
+class TrimSilenceTests(SimpleTestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def silence(self, seconds):
+        return (self.rng.standard_normal(int(seconds * SAMPLE_RATE)) * 1e-4).astype(np.float32)
+
+    def speech(self, seconds):
+        t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    def test_trims_edges_and_shortens_long_pauses(self):
+        samples = np.concatenate([self.silence(1), self.speech(1), self.silence(3), self.speech(1), self.silence(1)])
+        trimmed, stats = trim_silence(samples, max_pause=1.0, keep_pause=0.3)
+
+        self.assertEqual(stats['duration'], 7.0)
+        self.assertEqual(stats['pause_count'], 1)
+        # 150 ms of hangover is kept around speech
+        self.assertAlmostEqual(stats['leading_silence'], 0.85, delta=0.05)
+        self.assertAlmostEqual(stats['trailing_silence'], 0.85, delta=0.05)
+        self.assertAlmostEqual(stats['longest_pause'], 2.7, delta=0.05)
+        self.assertAlmostEqual(stats['removed_pause'], 2.4, delta=0.05)
+        self.assertAlmostEqual(len(trimmed) / SAMPLE_RATE, stats['trimmed_duration'], delta=0.01)
+        self.assertAlmostEqual(stats['trimmed_duration'], 2.9, delta=0.1)
+
+    def test_short_pauses_are_kept(self):
+        samples = np.concatenate([self.speech(1), self.silence(0.6), self.speech(1)])
+        trimmed, stats = trim_silence(samples, max_pause=1.0)
+        self.assertEqual(stats['removed_pause'], 0.0)
+        self.assertAlmostEqual(len(trimmed) / SAMPLE_RATE, 2.6, delta=0.05)
+
+    def test_audio_without_speech_is_unchanged(self):
+        samples = self.silence(2)
+        trimmed, stats = trim_silence(samples)
+        np.testing.assert_array_equal(trimmed, samples)
+        self.assertEqual(stats['speech_duration'], 0.0)
+
+    def test_empty_audio(self):
+        trimmed, stats = trim_silence(np.zeros(0, dtype=np.float32))
+        self.assertEqual(len(trimmed), 0)
+        self.assertEqual(stats['duration'], 0.0)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def breaker(self, probe=None, reset_timeout=60.0):
+        return CircuitBreaker('test', probe or (lambda: None), failure_threshold=3, reset_timeout=reset_timeout)
+
+    def wait_for_state(self, breaker, state):
+        deadline = time.monotonic() + 2
+        while breaker.state != state and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(breaker.state, state)
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = self.breaker()
+        breaker.record_failure(OSError("refused"))
+        breaker.record_failure(OSError("refused"))
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure(OSError("refused"))
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow_request())
+        self.assertEqual(breaker.snapshot()['last_error'], "refused")
+
+    def test_success_resets_the_failure_count(self):
+        breaker = self.breaker()
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.failures, 1)
+
+    def test_successful_probe_closes_the_circuit(self):
+        release = threading.Event()
+        probes = []
+
+        def probe():
+            probes.append(1)
+            release.wait(2)
+
+        breaker = self.breaker(probe, reset_timeout=0)
+        for _ in range(3):
+            breaker.record_failure()
+        self.assertFalse(breaker.allow_request())  # Starts the probe
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow_request())  # Still refused while probing, no second probe
+        release.set()
+        self.wait_for_state(breaker, CLOSED)
+        self.assertEqual(len(probes), 1)
+        self.assertTrue(breaker.allow_request())
+
+    def test_failed_probe_reopens_the_circuit(self):
+        def probe():
+            raise OSError("still down")
+
+        breaker = self.breaker(probe, reset_timeout=0)
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.allow_request()
+        self.wait_for_state(breaker, OPEN)
+        self.assertEqual(breaker.last_error, "still down")
+
+
+class FairLimiterTests(SimpleTestCase):
+    def wait_until_queued(self, limiter, count):
+        deadline = time.monotonic() + 2
+        while limiter.stats()['queued'] < count and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(limiter.stats()['queued'], count)
+
+    def test_admits_up_to_the_limit(self):
+        limiter = FairLimiter(2, queue_timeout=0.05)
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(limiter.stats()['in_flight'], 2)
+        with self.assertRaises(AdmissionTimeout):
+            limiter.acquire()
+        stats = limiter.stats()
+        self.assertEqual((stats['admitted'], stats['rejected'], stats['queued']), (2, 1, 0))
+
+    def test_slots_are_granted_in_arrival_order(self):
+        limiter = FairLimiter(1, queue_timeout=5)
+        limiter.acquire()
+        order = []
+
+        def worker(name):
+            with limiter.slot():
+                order.append(name)
+
+        threads = []
+        for number, name in enumerate(['first', 'second', 'third'], 1):
+            thread = threading.Thread(target=worker, args=(name,))
+            thread.start()
+            threads.append(thread)
+            self.wait_until_queued(limiter, number)
+        limiter.release()
+        for thread in threads:
+            thread.join(2)
+        self.assertEqual(order, ['first', 'second', 'third'])
+        self.assertEqual(limiter.stats()['in_flight'], 0)
+
+    def test_released_slot_goes_to_a_waiter_not_a_newcomer(self):
+        limiter = FairLimiter(1, queue_timeout=5)
+        limiter.acquire()
+        waiter = threading.Thread(target=limiter.acquire)
+        waiter.start()
+        self.wait_until_queued(limiter, 1)
+        limiter.release()
+        waiter.join(2)
+        self.assertEqual(limiter.stats()['in_flight'], 1)  # Handed over, never freed
+        limiter.queue_timeout = 0.05
+        with self.assertRaises(AdmissionTimeout):
+            limiter.acquire()
+
+    def test_cancelled_async_waiter_leaves_the_queue(self):
+        limiter = FairLimiter(1, queue_timeout=5)
+
+        async def scenario():
+            await limiter.aacquire()
+            task = asyncio.create_task(limiter.aacquire())
+            await asyncio.sleep(0.01)
+            self.assertEqual(limiter.stats()['queued'], 1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertEqual(limiter.stats()['queued'], 0)
+            limiter.release()
+
+        asyncio.run(scenario())
+        self.assertEqual(limiter.stats()['in_flight'], 0)
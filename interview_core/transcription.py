@@ -0,0 +1,325 @@
+"""
+Transcription backends and executors.
+
+Backends wrap a speech-to-text engine behind one interface and are selected with the
+TRANSCRIPTION_BACKEND setting:
+
+- WhisperBackend: the `openai-whisper` package (PyTorch, fp32 on CPU).
+- FasterWhisperBackend: CTranslate2 via `faster-whisper`, int8-quantised on CPU.
+
+Executors decide where a backend runs:
+
+- TranscriptionBatcher: concurrent uploads are collected for a short window (or until
+  the batch is full) and transcribed together with the backend's batch path.
+- ProcessPoolTranscriber: a pool of worker processes, each with its own backend and a
+  pinned torch thread count, so throughput scales with cores on CPU-only hosts.
+
+Everything accepts a file path, the raw uploaded bytes or a 16 kHz float32 array.
+"""
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import torch
+import whisper
+
+from .audio import decode_audio
+
+
+def load_audio(audio):
+    """
+    Return a 16 kHz mono float32 array for a file path, raw bytes or an array.
+
+    Bytes are decoded in-process (see audio.decode_audio); ffmpeg is only spawned for
+    formats neither soundfile nor PyAV can read.
+    """
+    if isinstance(audio, str):
+        with open(audio, 'rb') as f:
+            audio = f.read()
+    if isinstance(audio, (bytes, bytearray)):
+        try:
+            return decode_audio(bytes(audio))
+        except Exception as e:
+            print(f"In-process audio decode failed, falling back to ffmpeg: {e}")
+        fd, path = tempfile.mkstemp(suffix='.audio')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(audio)
+            return whisper.load_audio(path)
+        finally:
+            os.remove(path)
+    return audio
+
+
+class TranscriptionBackend:
+    """Interface for speech-to-text engines. Models are loaded once, in the constructor."""
+    name = None
+
+    def __init__(self, model_name='base', device='cpu', compute_type=None):
+        self.model_name = model_name
+        self.device = device
+        self.compute_type = compute_type
+
+    def transcribe(self, audio):
+        """Transcribe one 16 kHz float32 array"""
+        raise NotImplementedError
+
+    def transcribe_batch(self, audios):
+        """Transcribe several arrays; backends with a real batched path override this"""
+        return [self.transcribe(audio) for audio in audios]
+
+
+class WhisperBackend(TranscriptionBackend):
+    """openai-whisper (PyTorch)"""
+    name = 'whisper'
+
+    def __init__(self, model_name='base', device='cpu', compute_type=None):
+        super().__init__(model_name, device, compute_type)
+        self.model = whisper.load_model(model_name, device=device)
+
+    def transcribe(self, audio):
+        return self.model.transcribe(audio, fp16=self.model.device.type == 'cuda')["text"]
+
+    def transcribe_batch(self, audios):
+        """
+        Run all arrays through the encoder/decoder as one batched forward pass.
+
+        Each answer is split into 30 s windows and every window is one row of the batch;
+        the window texts are then joined per answer.
+        """
+        segments = []
+        owners = []
+        for index, samples in enumerate(audios):
+            for start in range(0, max(len(samples), 1), whisper.audio.N_SAMPLES):
+                segments.append(samples[start:start + whisper.audio.N_SAMPLES])
+                owners.append(index)
+
+        mels = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(segment), self.model.dims.n_mels)
+            for segment in segments
+        ]).to(self.model.device)
+        options = whisper.DecodingOptions(
+            fp16=self.model.device.type == 'cuda',
+            without_timestamps=True
+        )
+        with torch.no_grad():
+            results = whisper.decode(self.model, mels, options)
+
+        texts = [[] for _ in audios]
+        for owner, result in zip(owners, results):
+            texts[owner].append(result.text.strip())
+        return [" ".join(part for part in parts if part) for parts in texts]
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """CTranslate2 Whisper via faster-whisper; int8 weights by default for CPU hosts"""
+    name = 'faster-whisper'
+
+    def __init__(self, model_name='base', device='cpu', compute_type=None):
+        super().__init__(model_name, device, compute_type or 'int8')
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise ImportError("faster-whisper backend not installed. Please install it: pip install faster-whisper")
+        self.model = WhisperModel(
+            model_name,
+            device=device,
+            compute_type=self.compute_type,
+            cpu_threads=torch.get_num_threads()
+        )
+
+    def transcribe(self, audio):
+        segments, _ = self.model.transcribe(audio, beam_size=1)
+        return "".join(segment.text for segment in segments)
+
+
+TRANSCRIPTION_BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def load_backend(name='whisper', model_name='base', device='cpu', compute_type=None):
+    """Instantiate a backend by its TRANSCRIPTION_BACKEND name"""
+    try:
+        backend_class = TRANSCRIPTION_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown transcription backend: {name}")
+    return backend_class(model_name, device=device, compute_type=compute_type)
+
+
+class TranscriptionBatcher:
+    """
+    Collects transcription requests and runs them through a backend in batches.
+
+    A single background thread owns the backend, so callers on any thread (or event
+    loop, via asyncio.wrap_future) can submit safely.
+    """
+
+    def __init__(self, backend, window_ms=50, max_batch_size=8):
+        self.backend = backend
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, audio):
+        """Queue a file path, bytes or 16 kHz float32 array; returns a Future resolving to the transcript"""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((audio, future))
+        return future
+
+    def transcribe(self, audio, timeout=None):
+        return self.submit(audio).result(timeout=timeout)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='transcription-batcher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch):
+        audios = []
+        futures = []
+        for audio, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                audios.append(load_audio(audio))
+                futures.append(future)
+            except Exception as e:
+                future.set_exception(e)
+
+        if not audios:
+            return
+
+        try:
+            texts = self.backend.transcribe_batch(audios)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        for future, text in zip(futures, texts):
+            future.set_result(text)
+
+
+# Per-process backend used by ProcessPoolTranscriber workers
+_worker_backend = None
+
+
+def _init_worker(backend_name, model_name, compute_type, torch_threads):
+    """Pool initializer: pin torch threads so workers don't oversubscribe cores, then load this worker's model"""
+    global _worker_backend
+    torch.set_num_threads(torch_threads)
+    torch.set_num_interop_threads(1)
+    _worker_backend = load_backend(backend_name, model_name, compute_type=compute_type)
+
+
+def _transcribe_in_worker(audio):
+    return _worker_backend.transcribe(load_audio(audio))
+
+
+class ProcessPoolTranscriber:
+    """
+    Dispatches transcriptions to a pool of worker processes, each holding its own backend.
+
+    Workers are spawned (not forked) so no torch or thread state is inherited from the web
+    process, and each one is pinned to `torch_threads` intra-op threads.
+
+    If a worker dies (or fails to load its model) the executor is broken for good, so it is
+    replaced and the affected transcriptions are retried once on the new one. `healthy` is
+    False from a breakage until a worker next finishes a transcription.
+    """
+
+    def __init__(self, backend_name='whisper', model_name='base', compute_type=None, workers=None, torch_threads=None):
+        cpu_count = os.cpu_count() or 1
+        self.torch_threads = torch_threads or 1
+        self.workers = workers or max(1, cpu_count // self.torch_threads)
+        self._initargs = (backend_name, model_name, compute_type, self.torch_threads)
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+        self.healthy = True
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=self._initargs
+        )
+
+    def _replace(self, broken):
+        """Swap in a fresh executor unless another caller already replaced `broken`"""
+        with self._lock:
+            self.healthy = False
+            if self._executor is broken:
+                print("Transcription worker pool broke; starting a new one")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+
+    def submit(self, audio):
+        """Queue a file path, bytes or 16 kHz float32 array; returns a Future resolving to the transcript"""
+        future = Future()
+        self._dispatch(audio, future, retry=True)
+        return future
+
+    def _dispatch(self, audio, future, retry):
+        executor = self._executor
+        try:
+            inner = executor.submit(_transcribe_in_worker, audio)
+        except BrokenProcessPool as e:
+            self._replace(executor)
+            if retry:
+                self._dispatch(audio, future, retry=False)
+            else:
+                future.set_exception(e)
+            return
+
+        def done(inner):
+            if future.cancelled():
+                return
+            if inner.cancelled():
+                future.cancel()
+                return
+            error = inner.exception()
+            if isinstance(error, BrokenProcessPool):
+                self._replace(executor)
+                if retry:
+                    self._dispatch(audio, future, retry=False)
+                    return
+            else:
+                self.healthy = True
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(inner.result())
+
+        inner.add_done_callback(done)
+
+    def transcribe(self, audio, timeout=None):
+        return self.submit(audio).result(timeout=timeout)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,162 @@
+"""
+Content-addressed cache for synthesised speech.
+
+Audio files are named by a hash of (text, voice, format), so the same question is only
+ever sent to Edge-TTS once and every later request gets the existing file's URL. Files
+are written atomically (temp file + rename) and the directory is kept under a byte
+budget by evicting the least recently used entries; a hit refreshes the file's mtime.
+
+Entries for text known ahead of time (see `manage.py prerender_tts`) are pinned: they
+are listed in pinned.json in the cache directory and never evicted.
+
+Hit/miss counters are per process.
+"""
+import hashlib
+import json
+import os
+import threading
+import uuid
+
+AUDIO_FORMAT = 'mp3'
+PINNED_MANIFEST = 'pinned.json'
+
+
+class TTSCache:
+    def __init__(self, directory, base_url, max_bytes):
+        self.directory = directory
+        self.base_url = base_url.rstrip('/')
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._total_bytes = None  # Computed on first write
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(text, voice, fmt=AUDIO_FORMAT):
+        """Cache key for a piece of text; whitespace differences don't change the audio, so they don't change the key"""
+        normalised = " ".join(str(text).split())
+        return hashlib.sha256(f"{voice}\0{fmt}\0{normalised}".encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.{AUDIO_FORMAT}")
+
+    def url(self, key):
+        return f"{self.base_url}/{key}.{AUDIO_FORMAT}"
+
+    def get(self, key, count=True):
+        """
+        Return the cached file path for `key` (marking it recently used), or None on a miss.
+        Pass count=False for a second lookup of the same request so it isn't counted twice.
+        """
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            if count:
+                with self._lock:
+                    self.misses += 1
+            return None
+        if count:
+            with self._lock:
+                self.hits += 1
+        return path
+
+    def temp_path(self, key):
+        """A private path in the cache directory to render into before commit()"""
+        return os.path.join(self.directory, f"{key}.{uuid.uuid4().hex}.tmp")
+
+    def commit(self, key, temp_path):
+        """Atomically move a rendered file into place and enforce the size budget"""
+        path = self.path(key)
+        size = os.path.getsize(temp_path)
+        with self._lock:
+            # Two misses for the same text can both render; the second replaces the first
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(temp_path, path)
+            if self._total_bytes is not None:
+                self._total_bytes += size - replaced
+        self._evict_if_needed()
+        return path
+
+    def put(self, key, data):
+        """Store rendered audio bytes under `key`"""
+        temp_path = self.temp_path(key)
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            return self.commit(key, temp_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def pin(self, keys):
+        """Protect entries from eviction; the manifest is shared by every process using the directory"""
+        with self._lock:
+            pinned = self._pinned() | set(keys)
+            manifest = os.path.join(self.directory, PINNED_MANIFEST)
+            temp_path = f"{manifest}.{uuid.uuid4().hex}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(sorted(pinned), f)
+            os.replace(temp_path, manifest)
+        return len(pinned)
+
+    def _pinned(self):
+        try:
+            with open(os.path.join(self.directory, PINNED_MANIFEST)) as f:
+                return set(json.load(f))
+        except (FileNotFoundError, ValueError):
+            return set()
+
+    def _entries(self):
+        """(mtime, size, path) for every committed file"""
+        entries = []
+        suffix = f".{AUDIO_FORMAT}"
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(suffix):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict_if_needed(self):
+        with self._lock:
+            if self._total_bytes is not None and self._total_bytes <= self.max_bytes:
+                return
+            # Rescan: other processes share the directory, so the running total is only a hint
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total > self.max_bytes:
+                pinned = {self.path(key) for key in self._pinned()}
+                for _, size, path in sorted(entries):
+                    if path in pinned:
+                        continue
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                    total -= size
+                    self.evictions += 1
+                    if total <= self.max_bytes:
+                        break
+            self._total_bytes = total
+
+    def stats(self):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._entries())
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'pinned': len(self._pinned()),
+            }
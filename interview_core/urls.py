@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import StartSessionView, ProcessResponseView, landing_view, mic_test_view, index_view, interview_view, interview_report_view, health_check_view, download_report_pdf
+from .views import StartSessionView, ProcessResponseView, SubmitResponseView, job_status_view, job_events_view, landing_view, mic_test_view, index_view, interview_view, interview_report_view, health_check_view, download_report_pdf, process_response_async_view, process_response_stream_view, question_audio_view
 
 urlpatterns = [
     path('', landing_view, name='landing'),
@@ -10,5 +10,11 @@ urlpatterns = [
     path('report/<int:session_id>/download/', download_report_pdf, name='download_report_pdf'),
     path('api/start-session/', StartSessionView.as_view(), name='start_session'),
     path('api/process-response/', ProcessResponseView.as_view(), name='process_response'),
+    path('api/async/process-response/', process_response_async_view, name='process_response_async'),
+    path('api/stream/process-response/', process_response_stream_view, name='process_response_stream'),
+    path('api/submit-response/', SubmitResponseView.as_view(), name='submit_response'),
+    path('api/jobs/<int:job_id>/', job_status_view, name='job_status'),
+    path('api/jobs/<int:job_id>/events/', job_events_view, name='job_events'),
+    path('api/questions/<int:question_id>/audio/', question_audio_view, name='question_audio'),
     path('api/health/', health_check_view, name='health_check'),
 ]
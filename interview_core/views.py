@@ -1,14 +1,18 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render, get_object_or_404, aget_object_or_404
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.http import JsonResponse, HttpResponse
-from django.template.loader import render_to_string
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse, FileResponse
+from django.urls import reverse
 from rest_framework.views import APIView
 from rest_framework.response import Response as APIResponse
 from rest_framework import status, parsers
-from .models import InterviewSession, Response, Question
+from .models import InterviewSession, Response, Question, BackgroundJob
 from .serializers import InterviewSessionSerializer, ResponseSerializer
-from .ai_service import ai_service
+from .ai_service import ai_service, TTS_VOICE
+from .llm_client import llm_client
+from .streaming import sse_event
+from . import jobs, pipeline, reports
+import asyncio
 import os
 from django.conf import settings
 
@@ -25,28 +29,8 @@ def interview_report_view(request, session_id):
     """Generate and display comprehensive interview report"""
     session = get_object_or_404(InterviewSession, id=session_id)
     
-    # Gather all responses for this session
-    responses = Response.objects.filter(session=session).order_by('created_at')
-    
-    # Prepare data for report generation
-    session_data = {
-        'student_name': 'Student',  # Can be extended with user model
-        'topic': session.topic,
-        'interview_type': 'General',  # Can be extended
-        'responses': [
-            {
-                'question': resp.question.text,
-                'answer': resp.transcription,
-                'score': resp.score,
-                'feedback': resp.ai_feedback,
-                'time_taken': 0  # Can be tracked if needed
-            }
-            for resp in responses
-        ]
-    }
-    
-    # Generate comprehensive report using AI
-    report = ai_service.generate_comprehensive_report(session_data)
+    # Stored report, regenerated only if the responses changed since it was built
+    report, responses = reports.get_session_report(session)
     
     context = {
         'session': session,
@@ -60,7 +44,7 @@ def interview_view(request, session_id):
     session = get_object_or_404(InterviewSession, id=session_id)
     
     # Get the latest question for this session to display initially
-    latest_question = Question.objects.filter(topic=session.topic).last()
+    latest_question = pipeline.current_question(session)
     
     context = {
         'session_id': session.id, 
@@ -73,8 +57,7 @@ def interview_view(request, session_id):
     # If there is a question, try to ensure audio exists
     if latest_question:
         # Generate audio for the question
-        audio_url = ai_service.text_to_speech(latest_question.text, output_filename=f"question_{latest_question.id}.mp3")
-        context['initial_audio_url'] = audio_url
+        context['initial_audio_url'] = pipeline.question_audio_url(latest_question)
 
     return render(request, 'interview_core/interview.html', context)
 
@@ -88,13 +71,15 @@ def health_check_view(request):
         'overall': False
     }
     
-    # Check Ollama
+    # Check Ollama (circuit breaker state; an open circuit means requests use the fallbacks)
     health_status['ollama'] = ai_service.check_ollama_availability()
     
     # Check Whisper
     try:
-        model = ai_service.whisper_model
-        health_status['whisper'] = model is not None
+        if ai_service.transcription_mode == 'process':
+            health_status['whisper'] = ai_service.transcription_pool.healthy
+        else:
+            health_status['whisper'] = ai_service.transcription_backend is not None
     except:
         health_status['whisper'] = False
     
@@ -104,6 +89,9 @@ def health_check_view(request):
     return JsonResponse({
         'status': 'healthy' if health_status['overall'] else 'degraded',
         'services': health_status,
+        'ollama_circuit': ai_service.ollama_breaker.snapshot(),
+        'ollama_client': llm_client.stats(),
+        'tts_cache': ai_service.tts_cache.stats(),
         'message': 'All services operational' if health_status['overall'] else 'Some services unavailable - using fallback mode'
     })
 
@@ -116,68 +104,13 @@ class StartSessionView(APIView):
             session = serializer.save()
             
             # Generate highly specific opening question based on role
-            topic = session.topic
-            topic_lower = topic.lower()
-            
-            # Comprehensive role-based opening questions
-            if "python" in topic_lower:
-                initial_question_text = f"Good morning! Thank you for joining us today for the {session.topic} position. Let's start with - tell me about yourself, your background in Python programming, and what specifically interests you about this role?"
-            
-            elif "java" in topic_lower:
-                initial_question_text = f"Hello! Welcome to the interview for the {session.topic} position. To begin, could you tell me about yourself, your experience with Java development, and why you're interested in this opportunity?"
-            
-            elif "javascript" in topic_lower or "js developer" in topic_lower:
-                initial_question_text = f"Good morning! Thanks for being here for the {session.topic} interview. Let's start - tell me about yourself, your JavaScript experience, and what excites you about this role?"
-            
-            elif any(kw in topic_lower for kw in ['data scientist', 'data analyst', 'machine learning', 'ml engineer']):
-                initial_question_text = f"Hello! Welcome to the {session.topic} interview. Let's begin with you telling me about your background, your experience with data analysis or machine learning, and what draws you to this field?"
-            
-            elif any(kw in topic_lower for kw in ['web developer', 'frontend', 'backend', 'fullstack', 'full stack']):
-                initial_question_text = f"Good morning! Thank you for coming in for the {session.topic} position. Tell me about yourself, your web development experience, and what aspects of web development you're most passionate about?"
-            
-            elif any(kw in topic_lower for kw in ['devops', 'cloud engineer', 'aws', 'azure', 'kubernetes']):
-                initial_question_text = f"Hello! Welcome to the {session.topic} interview. Let's start with you introducing yourself, your experience with DevOps or cloud technologies, and why you're interested in this role?"
-            
-            elif any(kw in topic_lower for kw in ['qa', 'quality assurance', 'test engineer', 'sdet']):
-                initial_question_text = f"Good morning! Thanks for joining us for the {session.topic} position. Tell me about yourself, your testing experience, and what interests you about quality assurance?"
-            
-            elif any(kw in topic_lower for kw in ['mobile developer', 'android', 'ios', 'flutter', 'react native']):
-                initial_question_text = f"Hello! Welcome to the {session.topic} interview. Let's begin - tell me about yourself, your mobile development experience, and what excites you about building mobile applications?"
-            
-            elif any(kw in topic_lower for kw in ['database', 'dba', 'sql', 'mongodb', 'postgresql']):
-                initial_question_text = f"Good morning! Thank you for coming in for the {session.topic} position. Tell me about yourself, your database experience, and what interests you about database administration or engineering?"
-            
-            elif any(kw in topic_lower for kw in ['security', 'cybersecurity', 'infosec', 'penetration tester']):
-                initial_question_text = f"Hello! Welcome to the {session.topic} interview. Let's start with you telling me about your background, your interest in cybersecurity, and what specific areas of security you're most passionate about?"
-            
-            elif any(kw in topic_lower for kw in ['ui', 'ux', 'designer', 'product designer']):
-                initial_question_text = f"Good morning! Thanks for being here for the {session.topic} position. Tell me about yourself, your design background, and what aspects of UI/UX design you find most interesting?"
-            
-            elif any(kw in topic_lower for kw in ['project manager', 'scrum master', 'product manager', 'program manager']):
-                initial_question_text = f"Hello! Welcome to the {session.topic} interview. Let's begin with you introducing yourself, your project management experience, and what draws you to this leadership role?"
-            
-            elif any(kw in topic_lower for kw in ['business analyst', 'ba', 'systems analyst']):
-                initial_question_text = f"Good morning! Thank you for joining us for the {session.topic} position. Tell me about yourself, your experience in business analysis, and what interests you about this role?"
-            
-            elif any(kw in topic_lower for kw in ['network engineer', 'network admin', 'cisco', 'ccna']):
-                initial_question_text = f"Hello! Welcome to the {session.topic} interview. Let's start - tell me about yourself, your networking experience, and what aspects of network engineering you're most interested in?"
-            
-            elif any(kw in topic_lower for kw in ['software engineer', 'software developer', 'programmer', 'developer']):
-                initial_question_text = f"Good morning! Thank you for coming in for the {session.topic} position. Tell me about yourself, your software development experience, and what specifically interests you about this opportunity?"
-            
-            else:
-                # Generic but professional opening
-                initial_question_text = f"Good morning! Thank you for joining us today for the {session.topic} position. Let's start with - tell me about yourself, your relevant background and experience, and why you're interested in this role?"
+            initial_question_text = ai_service.opening_question(session.topic)
             
             # Create first question
-            question = Question.objects.create(
-                text=initial_question_text, 
-                topic=session.topic, 
-                difficulty='easy'
-            )
+            question = pipeline.ask_question(session, initial_question_text, 1, difficulty='easy')
             
             # Generate audio for first question
-            audio_url = ai_service.text_to_speech(initial_question_text, output_filename=f"question_{question.id}.mp3") 
+            audio_url = pipeline.question_audio_url(question)
             
             return APIResponse({
                 "session_id": session.id,
@@ -188,6 +121,35 @@ class StartSessionView(APIView):
             }, status=status.HTTP_201_CREATED)
         return APIResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+def _save_uploaded_response(request, session):
+    """Validate the answer upload and persist it. Returns (response_obj, audio_bytes, error_message)."""
+    # Get the current question being answered
+    question_id = request.data.get('question_id')
+    question = get_object_or_404(Question, id=question_id) if question_id else None
+
+    # If no question_id provided, get the latest question for this session
+    if not question:
+        question = pipeline.current_question(session)
+        if not question:
+            return None, None, "No question found"
+    
+    # Save Audio
+    audio_file = request.FILES.get('audio_file')
+    if not audio_file:
+        return None, None, "Audio file required"
+
+    # Keep the uploaded bytes so transcription can decode them in memory
+    audio_bytes = audio_file.read()
+    audio_file.seek(0)
+
+    response_obj = Response.objects.create(
+        session=session,
+        question=question,
+        audio_file=audio_file
+    )
+    return response_obj, audio_bytes, None
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class ProcessResponseView(APIView):
     parser_classes = [parsers.MultiPartParser, parsers.FormParser]
@@ -198,95 +160,217 @@ class ProcessResponseView(APIView):
             return APIResponse({"error": "Session ID required"}, status=status.HTTP_400_BAD_REQUEST)
         
         session = get_object_or_404(InterviewSession, id=session_id)
-        
-        # Get the current question being answered
-        question_id = request.data.get('question_id')
-        question = get_object_or_404(Question, id=question_id) if question_id else None
 
-        # If no question_id provided, get the latest question for this topic
-        if not question:
-            question = Question.objects.filter(topic=session.topic).last()
-            if not question:
-                return APIResponse({"error": "No question found"}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Save Audio
-        audio_file = request.FILES.get('audio_file')
-        if not audio_file:
-             return APIResponse({"error": "Audio file required"}, status=status.HTTP_400_BAD_REQUEST)
-
-        response_obj = Response.objects.create(
-            session=session,
-            question=question,
-            audio_file=audio_file
-        )
+        response_obj, audio_bytes, error = _save_uploaded_response(request, session)
+        if error:
+            return APIResponse({"error": error}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 1. Transcribe the audio
-        transcript = ai_service.transcribe_audio(response_obj.audio_file.path)
-        response_obj.transcription = transcript
-        response_obj.save()
-
-        # 2. Build conversation history for context
-        history = []
-        previous_responses = Response.objects.filter(session=session).order_by('created_at')
-        for resp in previous_responses:
-            history.append({
-                "question": resp.question.text,
-                "answer": resp.transcription,
-                "score": resp.score,
-                "feedback": resp.ai_feedback
-            })
-
-        # 3. Get AI evaluation and next question
-        ai_result = ai_service.generate_response(transcript, history, session.topic)
-        
-        # Update current response with feedback
-        response_obj.ai_feedback = ai_result.get('feedback', 'Thank you for your response.')
-        response_obj.score = ai_result.get('score', 7)
-        response_obj.save()
+        return APIResponse(pipeline.process_answer(response_obj, audio=audio_bytes), status=status.HTTP_200_OK)
 
-        # 4. Create next question
-        next_q_text = ai_result.get('next_question', "Thank you for your time. That concludes our interview.")
-        
-        # Check if interview should end (after 10-12 questions for comprehensive interview)
-        total_questions = Question.objects.filter(topic=session.topic).count()
-        
-        if total_questions >= 12 or "concludes" in next_q_text.lower() or "thank you for your time" in next_q_text.lower():
-            # Interview is complete
-            return APIResponse({
-                "feedback": response_obj.ai_feedback,
-                "score": response_obj.score,
-                "next_question": None,
-                "audio_url": None,
-                "interview_complete": True
-            }, status=status.HTTP_200_OK)
-        
-        # Create next question
-        next_question = Question.objects.create(
-            text=next_q_text, 
-            topic=session.topic, 
-            difficulty='medium'
-        )
 
-        # 5. Generate TTS for next question
-        audio_url = ai_service.text_to_speech(next_q_text, output_filename=f"question_{next_question.id}.mp3")
-        
+@method_decorator(csrf_exempt, name='dispatch')
+class SubmitResponseView(APIView):
+    """
+    Persist the answer and queue it for processing, returning a job id immediately.
+    Poll `job_status_view` or subscribe to `job_events_view` for the result.
+    """
+    parser_classes = [parsers.MultiPartParser, parsers.FormParser]
+
+    def post(self, request):
+        session_id = request.data.get('session_id')
+        if not session_id:
+            return APIResponse({"error": "Session ID required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        session = get_object_or_404(InterviewSession, id=session_id)
+
+        # The worker reads the saved file, so the in-memory bytes aren't needed here
+        response_obj, _, error = _save_uploaded_response(request, session)
+        if error:
+            return APIResponse({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        job = jobs.enqueue('process_response', response_id=response_obj.id)
         return APIResponse({
-            "feedback": response_obj.ai_feedback,
-            "score": response_obj.score,
-            "next_question": {
-                "id": next_question.id,
-                "text": next_question.text
-            },
-            "audio_url": audio_url,
-            "interview_complete": False
-        }, status=status.HTTP_200_OK)
+            "job_id": job.id,
+            "response_id": response_obj.id,
+            "status": job.status,
+            "status_url": reverse('job_status', args=[job.id]),
+            "events_url": reverse('job_events', args=[job.id])
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+def _job_payload(job):
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "result": job.result if job.status == 'done' else None,
+        "error": "Processing failed" if job.status == 'failed' else None
+    }
+
+
+def job_status_view(request, job_id):
+    """Polling endpoint for a queued job"""
+    job = get_object_or_404(BackgroundJob, id=job_id)
+    return JsonResponse(_job_payload(job))
+
+
+async def job_events_view(request, job_id):
+    """
+    Server-Sent Events stream for a queued job.
+
+    Emits a `status` event whenever the job changes state and a final `result` (or
+    `failed`) event carrying the feedback, score and next question. Serve through the
+    ASGI entry point so the open stream doesn't hold a sync worker.
+    """
+    job = await aget_object_or_404(BackgroundJob, id=job_id)
+    poll_interval = getattr(settings, 'JOB_POLL_INTERVAL', 1.0)
+    timeout = getattr(settings, 'JOB_EVENTS_TIMEOUT', 300)
+
+    async def event_stream():
+        last_status = None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            current = await BackgroundJob.objects.aget(id=job.id)
+            payload = _job_payload(current)
+            if current.status == 'done':
+                yield sse_event('result', payload)
+                return
+            if current.status == 'failed':
+                yield sse_event('failed', payload)
+                return
+            if current.status != last_status:
+                last_status = current.status
+                yield sse_event('status', payload)
+            if loop.time() > deadline:
+                # Client should fall back to polling status_url
+                yield sse_event('timeout', payload)
+                return
+            await asyncio.sleep(poll_interval)
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def _asave_uploaded_response(request):
+    """Async counterpart of _save_uploaded_response for plain Django async views"""
+    session_id = request.POST.get('session_id')
+    if not session_id:
+        return None, None, "Session ID required"
+
+    session = await aget_object_or_404(InterviewSession, id=session_id)
+
+    # Get the current question being answered
+    question_id = request.POST.get('question_id')
+    question = await aget_object_or_404(Question, id=question_id) if question_id else None
+
+    # If no question_id provided, get the latest question for this session
+    if not question:
+        question = await pipeline.acurrent_question(session)
+        if not question:
+            return None, None, "No question found"
+
+    # Save Audio
+    audio_file = request.FILES.get('audio_file')
+    if not audio_file:
+        return None, None, "Audio file required"
+
+    # Keep the uploaded bytes so transcription can decode them in memory
+    audio_bytes = audio_file.read()
+    audio_file.seek(0)
+
+    response_obj = await Response.objects.acreate(
+        session=session,
+        question=question,
+        audio_file=audio_file
+    )
+    return response_obj, audio_bytes, None
+
+
+@csrf_exempt
+async def process_response_async_view(request):
+    """
+    Async-native version of ProcessResponseView for the ASGI entry point (config/asgi.py).
+    Request and response payloads match ProcessResponseView; see pipeline.aprocess_answer.
+    """
+    if request.method != 'POST':
+        return JsonResponse({"error": "Method not allowed"}, status=405)
+
+    response_obj, audio_bytes, error = await _asave_uploaded_response(request)
+    if error:
+        return JsonResponse({"error": error}, status=400)
+
+    return JsonResponse(await pipeline.aprocess_answer(response_obj, audio=audio_bytes))
+
+
+@csrf_exempt
+async def process_response_stream_view(request):
+    """
+    Same upload as ProcessResponseView, answered as a Server-Sent Events stream.
+
+    Interviewer feedback is pushed token by token while the model generates it
+    (`transcript`, `feedback`..., then `result` with the usual payload), so the
+    candidate waits for the first token rather than the full completion. The
+    interview page's submit code (static/js/interview.js) has to POST here and read
+    the stream to render feedback as it arrives.
+    """
+    if request.method != 'POST':
+        return JsonResponse({"error": "Method not allowed"}, status=405)
+
+    response_obj, audio_bytes, error = await _asave_uploaded_response(request)
+    if error:
+        return JsonResponse({"error": error}, status=400)
+
+    async def event_stream():
+        async for event, data in pipeline.astream_answer(response_obj, audio=audio_bytes):
+            yield sse_event(event, data)
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def question_audio_view(request, question_id):
+    """
+    Chunked MP3 for a question, synthesised sentence by sentence.
+
+    Playback can start as soon as the first sentence is rendered while later ones are
+    still in flight; once the text has been fully rendered the cached file is served.
+    This URL is only handed out after cached_speech_url missed, so the lookup here isn't
+    counted again in the cache stats.
+    """
+    question = await aget_object_or_404(Question, id=question_id)
+    cache = ai_service.tts_cache
+    file_path = cache.get(cache.key(question.text, TTS_VOICE), count=False)
+    if file_path is not None:
+        try:
+            return FileResponse(open(file_path, 'rb'), content_type='audio/mpeg')
+        except FileNotFoundError:
+            pass  # Evicted since the lookup; synthesise it again
+
+    response = StreamingHttpResponse(
+        ai_service.astream_speech(question.text),
+        content_type='audio/mpeg'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 def download_report_pdf(request, session_id):
-    """Generate and download PDF report"""
+    """
+    Download the session's PDF report.
+
+    PDFs are rendered by a background job when the interview completes; until the file
+    for the current responses exists this returns 202 "pending" with a Retry-After hint
+    (and queues the render if nothing is working on it). Browsers navigating here get a
+    "preparing your PDF" page that refreshes itself instead of the JSON. If the render job
+    failed for the current report this returns 500 with the job's error.
+    """
     try:
-        from weasyprint import HTML, CSS
-        from weasyprint.text.fonts import FontConfiguration
+        import weasyprint  # noqa: F401
     except ImportError:
         # Fallback if WeasyPrint is not installed
         return HttpResponse(
@@ -296,47 +380,40 @@ def download_report_pdf(request, session_id):
     
     session = get_object_or_404(InterviewSession, id=session_id)
     
-    # Gather all responses for this session
-    responses = Response.objects.filter(session=session).order_by('created_at')
-    
-    # Prepare data for report generation
-    session_data = {
-        'student_name': 'Student',
-        'topic': session.topic,
-        'interview_type': 'General',
-        'responses': [
-            {
-                'question': resp.question.text,
-                'answer': resp.transcription,
-                'score': resp.score,
-                'feedback': resp.ai_feedback,
-                'time_taken': 0
-            }
-            for resp in responses
-        ]
-    }
+    pdf_path = reports.stored_report_pdf(session)
+    if pdf_path is None and not getattr(settings, 'REPORT_PDF_BACKGROUND', True):
+        pdf_path = reports.render_report_pdf(session)
     
-    # Generate comprehensive report using AI
-    report = ai_service.generate_comprehensive_report(session_data)
-    
-    context = {
-        'session': session,
-        'report': report,
-        'responses': responses
-    }
-    
-    # Render HTML template
-    html_string = render_to_string('interview_core/report_pdf.html', context)
-    
-    # Generate PDF
-    font_config = FontConfiguration()
-    html = HTML(string=html_string, base_url=request.build_absolute_uri())
-    
-    # Create PDF
-    pdf = html.write_pdf(font_config=font_config)
-    
-    # Create response
-    response = HttpResponse(pdf, content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="interview_report_{session.id}.pdf"'
+    if pdf_path is None:
+        job = reports.request_report_pdf(session)
+        wants_html = 'text/html' in request.headers.get('Accept', '')
+        if job.status == 'failed':
+            error = (job.error or 'PDF rendering failed').strip().splitlines()[-1]
+            if wants_html:
+                return render(request, 'interview_core/report_pdf_pending.html', {
+                    'session': session,
+                    'error': error
+                }, status=500)
+            return JsonResponse({'status': 'failed', 'job_id': job.id, 'error': error}, status=500)
+
+        retry_after = getattr(settings, 'REPORT_PDF_RETRY_AFTER', 5)
+        if wants_html:
+            response = render(request, 'interview_core/report_pdf_pending.html', {
+                'session': session,
+                'retry_after': retry_after
+            }, status=202)
+        else:
+            response = JsonResponse({
+                'status': 'pending',
+                'job_id': job.id,
+                'status_url': reverse('job_status', args=[job.id])
+            }, status=202)
+        response['Retry-After'] = str(retry_after)
+        return response
     
-    return response
+    return FileResponse(
+        open(pdf_path, 'rb'),
+        as_attachment=True,
+        filename=f"interview_report_{session.id}.pdf",
+        content_type='application/pdf'
+    )
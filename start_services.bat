@@ -14,7 +14,7 @@ if %ERRORLEVEL% NEQ 0 (
     exit /b 1
 )
 
-echo [1/3] Checking Ollama service...
+echo [1/4] Checking Ollama service...
 ollama list >nul 2>nul
 if %ERRORLEVEL% NEQ 0 (
     echo Ollama service is not running. Starting Ollama...
@@ -26,19 +26,26 @@ if %ERRORLEVEL% NEQ 0 (
 )
 
 echo.
-echo [2/3] Checking if llama3 model is available...
-ollama list | findstr "llama3" >nul 2>nul
-if %ERRORLEVEL% NEQ 0 (
-    echo llama3 model not found. Pulling llama3 model...
-    echo This may take a few minutes...
-    ollama pull llama3
-    echo llama3 model downloaded successfully.
-) else (
-    echo llama3 model is available.
+echo [2/4] Checking that the configured models are available...
+REM Keep this list in sync with OLLAMA_MODELS in config/settings.py
+for %%M in (llama3.2:3b llama3:latest) do (
+    ollama list | findstr /C:"%%M" >nul 2>nul
+    if errorlevel 1 (
+        echo %%M model not found. Pulling %%M model...
+        echo This may take a few minutes...
+        ollama pull %%M
+        echo %%M model downloaded successfully.
+    ) else (
+        echo %%M model is available.
+    )
 )
 
 echo.
-echo [3/3] Starting Django development server...
+echo [3/4] Starting background job worker...
+start "Job Worker" python manage.py process_jobs
+
+echo.
+echo [4/4] Starting Django development server...
 echo.
 python manage.py runserver
 